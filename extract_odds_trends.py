@@ -7,6 +7,7 @@ import asyncio
 import os
 import json
 import re
+from contextlib import asynccontextmanager
 from datetime import datetime
 from playwright.async_api import async_playwright
 from pocketbase import PocketBase
@@ -94,25 +95,21 @@ def extract_race_info_from_page(page_text):
         print(f"⚠️ Error extracting race info: {str(e)}")
         return None
 
-async def extract_race_odds(race_number=1):
-    """Extract odds for latest race using base URL"""
-    try:
-        # Use base URL to get latest race data
-        base_url = "https://bet.hkjc.com/ch/racing/pwin/"
-        print(f"🏇 Extracting Race {race_number} from latest race data")
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    '--no-sandbox',
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-web-security',
-                    '--disable-features=VizDisplayCompositor'
-                ]
-            )
-
-            context = await browser.new_context(
+@asynccontextmanager
+async def browser_context():
+    """Launch Chromium once and yield a browser context to share across races"""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=True,
+            args=[
+                '--no-sandbox',
+                '--disable-blink-features=AutomationControlled',
+                '--disable-web-security',
+                '--disable-features=VizDisplayCompositor'
+            ]
+        )
+        try:
+            yield await browser.new_context(
                 user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 viewport={'width': 1920, 'height': 1080},
                 locale='zh-HK',
@@ -120,177 +117,194 @@ async def extract_race_odds(race_number=1):
                 accept_downloads=False,
                 ignore_https_errors=True
             )
+        finally:
+            await browser.close()
+
+async def extract_race_odds(race_number=1, context=None):
+    """Extract odds for latest race using base URL
+
+    context: optional shared browser context from browser_context(); a browser
+    is launched for this race otherwise
+    """
+    try:
+        if context is None:
+            async with browser_context() as context:
+                return await extract_race_odds(race_number, context)
+
+        # Use base URL to get latest race data
+        base_url = "https://bet.hkjc.com/ch/racing/pwin/"
+        print(f"🏇 Extracting Race {race_number} from latest race data")
+
+        page = await context.new_page()
+
+        try:
+            # Load base URL to get latest race
+            print("   🌐 Loading HKJC page...")
+            await page.goto(base_url, wait_until='networkidle', timeout=30000)
+
+            # Wait for JavaScript to load content with multiple strategies
+            print("   ⏳ Waiting for JavaScript content to load...")
+
+            # Strategy 1: Wait for page to be fully loaded
+            await page.wait_for_load_state('networkidle', timeout=20000)
 
-            page = await context.new_page()
+            # Strategy 2: Wait longer for dynamic content
+            print("   ⏳ Waiting for dynamic content...")
+            await page.wait_for_timeout(15000)
 
+            # Strategy 3: Try to wait for specific odds-related content
             try:
-                # Load base URL to get latest race
-                print("   🌐 Loading HKJC page...")
-                await page.goto(base_url, wait_until='networkidle', timeout=30000)
+                # Wait for content that suggests odds data is present
+                await page.wait_for_function(
+                    "() => document.body.textContent.length > 5000 || document.querySelectorAll('table').length > 0",
+                    timeout=20000
+                )
+                print("   ✅ Content appears to be loaded")
+            except:
+                print("   ⚠️ Timeout waiting for content, but continuing...")
+
+            # Strategy 4: Check multiple times for content
+            for attempt in range(3):
+                page_text = await page.text_content('body')
+                content_length = len(page_text)
 
-                # Wait for JavaScript to load content with multiple strategies
-                print("   ⏳ Waiting for JavaScript content to load...")
+                print(f"   📋 Attempt {attempt + 1}: Content length = {content_length} chars")
 
-                # Strategy 1: Wait for page to be fully loaded
-                await page.wait_for_load_state('networkidle', timeout=20000)
+                if "You need to enable JavaScript" not in page_text and content_length > 5000:
+                    print("   ✅ JavaScript content successfully loaded!")
+                    break
+                elif attempt < 2:
+                    print(f"   ⏳ Content still loading, waiting more... (attempt {attempt + 1}/3)")
+                    await page.wait_for_timeout(10000)
+                else:
+                    print("   ⚠️ Content may not be fully loaded, but proceeding with extraction...")
+                    break
 
-                # Strategy 2: Wait longer for dynamic content
-                print("   ⏳ Waiting for dynamic content...")
-                await page.wait_for_timeout(15000)
+            # Get the page content to extract race info
+            page_text = await page.text_content('body')
 
-                # Strategy 3: Try to wait for specific odds-related content
-                try:
-                    # Wait for content that suggests odds data is present
-                    await page.wait_for_function(
-                        "() => document.body.textContent.length > 5000 || document.querySelectorAll('table').length > 0",
-                        timeout=20000
-                    )
-                    print("   ✅ Content appears to be loaded")
-                except:
-                    print("   ⚠️ Timeout waiting for content, but continuing...")
+            # Extract race date and venue from the current page
+            race_info = extract_race_info_from_page(page_text)
+            
+            if not race_info:
+                print(f"   ⚠️ Could not extract race info from current page")
+                return None
+            
+            race_date, venue = race_info
+            venue_name = "Sha Tin" if venue == "ST" else "Happy Valley"
+            print(f"   ✅ Found current race: {race_date} {venue} ({venue_name})")
+
+            # Navigate to specific race if not race 1
+            if race_number != 1:
+                race_url = f"https://bet.hkjc.com/ch/racing/pwin/{race_date}/{venue}/{race_number}"
+                print(f"   🔗 Navigating to: {race_url}")
+                await page.goto(race_url, wait_until='networkidle', timeout=30000)
+
+                # Check if URL redirected (race doesn't exist)
+                current_url = page.url
+                print(f"   📋 Current URL after navigation: {current_url}")
+
+                # Extract race number from current URL to check for redirect
+                url_race_match = re.search(r'/(\d+)$', current_url)
+                if url_race_match:
+                    actual_race_number = int(url_race_match.group(1))
+                    if actual_race_number != race_number:
+                        print(f"   ⚠️ URL redirected from Race {race_number} to Race {actual_race_number}")
+                        print(f"   ❌ Race {race_number} does not exist - skipping")
+                        return None
+                    else:
+                        print(f"   ✅ Successfully navigated to Race {race_number}")
 
-                # Strategy 4: Check multiple times for content
-                for attempt in range(3):
+                # Wait for race page content to load
+                print("   ⏳ Waiting for race page content...")
+                await page.wait_for_timeout(12000)
+
+                # Check content multiple times
+                for attempt in range(2):
                     page_text = await page.text_content('body')
                     content_length = len(page_text)
 
-                    print(f"   📋 Attempt {attempt + 1}: Content length = {content_length} chars")
-
-                    if "You need to enable JavaScript" not in page_text and content_length > 5000:
-                        print("   ✅ JavaScript content successfully loaded!")
+                    if "You need to enable JavaScript" not in page_text and content_length > 3000:
+                        print(f"   ✅ Race page content loaded ({content_length} chars)")
                         break
-                    elif attempt < 2:
-                        print(f"   ⏳ Content still loading, waiting more... (attempt {attempt + 1}/3)")
+                    elif attempt < 1:
+                        print(f"   ⏳ Race page still loading, waiting more...")
                         await page.wait_for_timeout(10000)
                     else:
-                        print("   ⚠️ Content may not be fully loaded, but proceeding with extraction...")
+                        print(f"   ⚠️ Race page content may be limited ({content_length} chars)")
                         break
 
-                # Get the page content to extract race info
-                page_text = await page.text_content('body')
-
-                # Extract race date and venue from the current page
-                race_info = extract_race_info_from_page(page_text)
-                
-                if not race_info:
-                    print(f"   ⚠️ Could not extract race info from current page")
-                    return None
-                
-                race_date, venue = race_info
-                venue_name = "Sha Tin" if venue == "ST" else "Happy Valley"
-                print(f"   ✅ Found current race: {race_date} {venue} ({venue_name})")
-
-                # Navigate to specific race if not race 1
-                if race_number != 1:
-                    race_url = f"https://bet.hkjc.com/ch/racing/pwin/{race_date}/{venue}/{race_number}"
-                    print(f"   🔗 Navigating to: {race_url}")
-                    await page.goto(race_url, wait_until='networkidle', timeout=30000)
-
-                    # Check if URL redirected (race doesn't exist)
-                    current_url = page.url
-                    print(f"   📋 Current URL after navigation: {current_url}")
-
-                    # Extract race number from current URL to check for redirect
-                    url_race_match = re.search(r'/(\d+)$', current_url)
-                    if url_race_match:
-                        actual_race_number = int(url_race_match.group(1))
-                        if actual_race_number != race_number:
-                            print(f"   ⚠️ URL redirected from Race {race_number} to Race {actual_race_number}")
-                            print(f"   ❌ Race {race_number} does not exist - skipping")
-                            return None
-                        else:
-                            print(f"   ✅ Successfully navigated to Race {race_number}")
-
-                    # Wait for race page content to load
-                    print("   ⏳ Waiting for race page content...")
-                    await page.wait_for_timeout(12000)
-
-                    # Check content multiple times
-                    for attempt in range(2):
-                        page_text = await page.text_content('body')
-                        content_length = len(page_text)
-
-                        if "You need to enable JavaScript" not in page_text and content_length > 3000:
-                            print(f"   ✅ Race page content loaded ({content_length} chars)")
-                            break
-                        elif attempt < 1:
-                            print(f"   ⏳ Race page still loading, waiting more...")
-                            await page.wait_for_timeout(10000)
-                        else:
-                            print(f"   ⚠️ Race page content may be limited ({content_length} chars)")
-                            break
-
-                # Extract REAL odds data from the page
-                print("🔍 Extracting real odds data from HKJC page...")
+            # Extract REAL odds data from the page
+            print("🔍 Extracting real odds data from HKJC page...")
 
-                # Debug: Show current page info
-                current_url = page.url
-                page_title = await page.title()
-                page_content = await page.text_content('body')
-                print(f"   📋 Current URL: {current_url}")
-                print(f"   📋 Page title: {page_title}")
-                print(f"   📋 Content length: {len(page_content)} chars")
+            # Debug: Show current page info
+            current_url = page.url
+            page_title = await page.title()
+            page_content = await page.text_content('body')
+            print(f"   📋 Current URL: {current_url}")
+            print(f"   📋 Page title: {page_title}")
+            print(f"   📋 Content length: {len(page_content)} chars")
 
-                # Show a sample of the content to see what we're getting
-                if page_content:
-                    # Look for Chinese characters or numbers that might indicate odds
-                    sample = page_content[:500].replace('\n', ' ').strip()
-                    print(f"   📋 Content sample: {sample}...")
+            # Show a sample of the content to see what we're getting
+            if page_content:
+                # Look for Chinese characters or numbers that might indicate odds
+                sample = page_content[:500].replace('\n', ' ').strip()
+                print(f"   📋 Content sample: {sample}...")
 
-                raw_odds_data = await extract_win_odds_from_page(page)
+            raw_odds_data = await extract_win_odds_from_page(page)
 
-                # Check if any odds data was found
-                has_odds_data = raw_odds_data and len(raw_odds_data) > 0
+            # Check if any odds data was found
+            has_odds_data = raw_odds_data and len(raw_odds_data) > 0
 
-                if not has_odds_data:
-                    print(f"   ⚠️ No odds data found for Race {race_number} - skipping")
-                    return None
+            if not has_odds_data:
+                print(f"   ⚠️ No odds data found for Race {race_number} - skipping")
+                return None
 
-                # Convert raw odds data to structured horses_data format
-                horses_data = convert_to_horses_data(raw_odds_data)
+            # Convert raw odds data to structured horses_data format
+            horses_data = convert_to_horses_data(raw_odds_data)
 
-                if not horses_data:
-                    print(f"   ⚠️ Could not convert odds data to horses format for Race {race_number} - skipping")
-                    return None
+            if not horses_data:
+                print(f"   ⚠️ Could not convert odds data to horses format for Race {race_number} - skipping")
+                return None
 
-                # Extract place odds from the same table (place odds are in the last column)
-                print("🔍 Extracting place odds from same table...")
-                try:
-                    place_horses_data = convert_to_horses_data(raw_odds_data, is_place_odds=True)
+            # Extract place odds from the same table (place odds are in the last column)
+            print("🔍 Extracting place odds from same table...")
+            try:
+                place_horses_data = convert_to_horses_data(raw_odds_data, is_place_odds=True)
 
-                    if place_horses_data:
-                        print(f"   ✅ Successfully extracted place odds for {len(place_horses_data)} horses")
-                        # Merge place odds into win odds data
-                        horses_data = merge_place_odds(horses_data, place_horses_data)
-                    else:
-                        print("   ⚠️ Could not extract place odds data from table")
+                if place_horses_data:
+                    print(f"   ✅ Successfully extracted place odds for {len(place_horses_data)} horses")
+                    # Merge place odds into win odds data
+                    horses_data = merge_place_odds(horses_data, place_horses_data)
+                else:
+                    print("   ⚠️ Could not extract place odds data from table")
 
-                except Exception as e:
-                    print(f"   ⚠️ Error extracting place odds: {str(e)}")
-                    # Continue without place odds
-
-                # Prepare result with structured horse data (matching 2025-07-05 format)
-                race_data = {
-                    "race_info": {
-                        "race_date": race_date,
-                        "venue": venue,
-                        "race_number": race_number,
-                        "source_url": page.url,
-                        "scraped_at": datetime.now().isoformat()
-                    },
-                    "horses_data": horses_data,
-                    "extraction_summary": {
-                        "horses_extracted": len(horses_data),
-                        "data_extraction_successful": True,
-                        "method": "base_url_upcoming_race_real_extraction"
-                    }
+            except Exception as e:
+                print(f"   ⚠️ Error extracting place odds: {str(e)}")
+                # Continue without place odds
+
+            # Prepare result with structured horse data (matching 2025-07-05 format)
+            race_data = {
+                "race_info": {
+                    "race_date": race_date,
+                    "venue": venue,
+                    "race_number": race_number,
+                    "source_url": page.url,
+                    "scraped_at": datetime.now().isoformat()
+                },
+                "horses_data": horses_data,
+                "extraction_summary": {
+                    "horses_extracted": len(horses_data),
+                    "data_extraction_successful": True,
+                    "method": "base_url_upcoming_race_real_extraction"
                 }
+            }
 
-                print(f"   ✅ Successfully extracted race data with {len(horses_data)} horses")
-                return race_data
+            print(f"   ✅ Successfully extracted race data with {len(horses_data)} horses")
+            return race_data
 
-            finally:
-                await browser.close()
+        finally:
+            await page.close()
                 
     except Exception as e:
         print(f"   ❌ Error extracting race odds: {str(e)}")
@@ -752,100 +766,102 @@ async def main():
     print("\n🔍 Getting upcoming race information with live odds...")
     
     try:
-        # Extract race 1 to get race info
-        first_race_data = await extract_race_odds(1)
-
-        if not first_race_data:
-            print("⚠️ No odds data found for Race 1 - will try other races")
-            print("💡 This is normal if:")
-            print("   • HKJC has anti-bot protection blocking odds data")
-            print("   • Betting is closed for this race")
-            print("   • Race has already started or finished")
-
-            # Try to get race info from a different approach or continue anyway
-            print("\n🔄 Continuing to process other races...")
-            race_date = "2025-07-13"  # Default upcoming date
-            venue = "ST"  # Default venue
-            venue_name = "Sha Tin"
-        else:
-            # Extract race info from the first race data
-            race_info = first_race_data.get('race_info', {})
-            race_date = race_info.get('race_date')
-            venue = race_info.get('venue')
-            venue_name = "Sha Tin" if venue == "ST" else "Happy Valley"
-        
-        print(f"✅ Target races: {race_date} {venue} ({venue_name})")
+        # One browser for every race of the run; each race opens its own page
+        async with browser_context() as context:
+            # Extract race 1 to get race info
+            first_race_data = await extract_race_odds(1, context)
+
+            if not first_race_data:
+                print("⚠️ No odds data found for Race 1 - will try other races")
+                print("💡 This is normal if:")
+                print("   • HKJC has anti-bot protection blocking odds data")
+                print("   • Betting is closed for this race")
+                print("   • Race has already started or finished")
+
+                # Try to get race info from a different approach or continue anyway
+                print("\n🔄 Continuing to process other races...")
+                race_date = "2025-07-13"  # Default upcoming date
+                venue = "ST"  # Default venue
+                venue_name = "Sha Tin"
+            else:
+                # Extract race info from the first race data
+                race_info = first_race_data.get('race_info', {})
+                race_date = race_info.get('race_date')
+                venue = race_info.get('venue')
+                venue_name = "Sha Tin" if venue == "ST" else "Happy Valley"
+            
+            print(f"✅ Target races: {race_date} {venue} ({venue_name})")
 
-        # Process all races (default to 12)
-        total_races = 12
-        print(f"📊 Processing {total_races} races (will skip races with no odds data)")
+            # Process all races (default to 12)
+            total_races = 12
+            print(f"📊 Processing {total_races} races (will skip races with no odds data)")
 
-        # Initialize counters
-        total_extracted = 0
-        total_saved = 0
+            # Initialize counters
+            total_extracted = 0
+            total_saved = 0
 
-        # Process first race if data was found
-        if first_race_data:
-            total_extracted = 1
+            # Process first race if data was found
+            if first_race_data:
+                total_extracted = 1
 
-            # Save first race data
-            formatted_date = race_date.replace('-', '_')
-            json_filename = f"{OUTPUT_DIR}/win_odds_trends_{formatted_date}_{venue}_R1.json"
-            os.makedirs(OUTPUT_DIR, exist_ok=True)
+                # Save first race data
+                formatted_date = race_date.replace('-', '_')
+                json_filename = f"{OUTPUT_DIR}/win_odds_trends_{formatted_date}_{venue}_R1.json"
+                os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-            with open(json_filename, 'w', encoding='utf-8') as f:
-                json.dump(first_race_data, f, ensure_ascii=False, indent=2)
+                with open(json_filename, 'w', encoding='utf-8') as f:
+                    json.dump(first_race_data, f, ensure_ascii=False, indent=2)
 
-            # Save to PocketBase
-            if save_to_pocketbase(first_race_data, race_date, venue, 1):
-                total_saved = 1
+                # Save to PocketBase
+                if save_to_pocketbase(first_race_data, race_date, venue, 1):
+                    total_saved = 1
 
-            # Count extracted horses data
-            horses_data = first_race_data.get('horses_data', [])
-            horses_count = len(horses_data) if horses_data else 0
-            print(f"   ✅ Race 1: {horses_count} horses extracted")
-        else:
-            print(f"   ⏭️ Race 1: Skipped (no odds data found)")
-        
-        # Process remaining races
-        print(f"\n🏁 Processing remaining races for {race_date} {venue}")
-        print("-" * 50)
-        
-        for race_number in range(2, total_races + 1):
-            try:
-                print(f"\n🏁 Processing Race {race_number}...")
-                
-                # Extract odds data
-                data = await extract_race_odds(race_number)
+                # Count extracted horses data
+                horses_data = first_race_data.get('horses_data', [])
+                horses_count = len(horses_data) if horses_data else 0
+                print(f"   ✅ Race 1: {horses_count} horses extracted")
+            else:
+                print(f"   ⏭️ Race 1: Skipped (no odds data found)")
+            
+            # Process remaining races
+            print(f"\n🏁 Processing remaining races for {race_date} {venue}")
+            print("-" * 50)
+            
+            for race_number in range(2, total_races + 1):
+                try:
+                    print(f"\n🏁 Processing Race {race_number}...")
+                    
+                    # Extract odds data
+                    data = await extract_race_odds(race_number, context)
 
-                if data:
-                    total_extracted += 1
+                    if data:
+                        total_extracted += 1
 
-                    # Save backup JSON
-                    formatted_date = race_date.replace('-', '_')
-                    json_filename = f"{OUTPUT_DIR}/win_odds_trends_{formatted_date}_{venue}_R{race_number}.json"
+                        # Save backup JSON
+                        formatted_date = race_date.replace('-', '_')
+                        json_filename = f"{OUTPUT_DIR}/win_odds_trends_{formatted_date}_{venue}_R{race_number}.json"
 
-                    with open(json_filename, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, ensure_ascii=False, indent=2)
+                        with open(json_filename, 'w', encoding='utf-8') as f:
+                            json.dump(data, f, ensure_ascii=False, indent=2)
 
-                    # Save to PocketBase
-                    if save_to_pocketbase(data, race_date, venue, race_number):
-                        total_saved += 1
+                        # Save to PocketBase
+                        if save_to_pocketbase(data, race_date, venue, race_number):
+                            total_saved += 1
 
-                    # Count extracted horses data
-                    horses_data = data.get('horses_data', [])
-                    horses_count = len(horses_data) if horses_data else 0
-                    print(f"   ✅ Race {race_number}: {horses_count} horses extracted")
-                else:
-                    print(f"   ⏭️ Race {race_number}: Skipped (no odds data found)")
-                
-                # Small delay between requests
-                await asyncio.sleep(2)
-                
-            except Exception as e:
-                print(f"   ❌ Race {race_number}: Error - {str(e)}")
-                continue
-        
+                        # Count extracted horses data
+                        horses_data = data.get('horses_data', [])
+                        horses_count = len(horses_data) if horses_data else 0
+                        print(f"   ✅ Race {race_number}: {horses_count} horses extracted")
+                    else:
+                        print(f"   ⏭️ Race {race_number}: Skipped (no odds data found)")
+                    
+                    # Small delay between requests
+                    await asyncio.sleep(2)
+                    
+                except Exception as e:
+                    print(f"   ❌ Race {race_number}: Error - {str(e)}")
+                    continue
+            
     except Exception as e:
         print(f"❌ Error in main extraction: {str(e)}")
     
@@ -0,0 +1,49 @@
+"""
+JSON file helpers shared by the HKJC scrapers.
+
+Files are written in full to a temporary file and then atomically moved into
+place, so readers (including the results cache) never see a partial file.
+"""
+import dataclasses
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+def _json_default(obj):
+    """Serialize dataclasses (e.g. HorseOdds) for the stdlib encoder, as orjson does natively"""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_json(data):
+    """Serialize data as indented UTF-8 JSON bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2, default=_json_default).encode('utf-8')
+
+def write_file_atomic(filepath, data):
+    """Write bytes to filepath via a temporary file, then atomically replace the previous file.
+
+    The temporary file is removed if anything fails, leaving any previous file untouched.
+    """
+    tmp_filepath = f"{filepath}.tmp"
+    try:
+        fd = os.open(tmp_filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            # os.write may write fewer bytes than asked; keep going until all are written
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_filepath, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_filepath)
+        except OSError:
+            pass
+        raise
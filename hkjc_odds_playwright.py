@@ -1,10 +1,12 @@
 import asyncio
-import json
 import re
 import os
+from dataclasses import dataclass
+from urllib.parse import urlparse
 from playwright.async_api import async_playwright
 from datetime import datetime
 from dotenv import load_dotenv
+from hkjc_json_io import dumps_json, write_file_atomic
 
 # Load environment variables from .env file
 load_dotenv()
@@ -12,6 +14,20 @@ load_dotenv()
 # Output directory for JSON files
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "odds_data")
 
+# Valid horse numbers for a race card (1-14)
+VALID_HORSE_NUMS = frozenset(map(str, range(1, 15)))
+
+# Race time in page text, either labelled (開跑時間/Race Time) or a bare HH:MM
+_TIME_RE = re.compile(r'(?:開跑時間|Race Time)[：:]\s*(\d{1,2}:\d{2})|(\d{1,2}:\d{2})')
+
+@dataclass(slots=True)
+class HorseOdds:
+    """Win/Place odds for a single runner"""
+    horse_number: str
+    horse_name: str
+    win_odds: str
+    place_odds: str
+
 def parse_url(url):
     """Parse HKJC odds URL to extract race details"""
     # URL formats:
@@ -32,13 +48,14 @@ def parse_url(url):
 
     raise ValueError(f"Invalid HKJC odds URL format: {url}")
 
-async def scrape_odds_with_playwright(url):
+async def scrape_odds_with_playwright(url, race_details=None):
     """
     Scrape odds data using Playwright directly
+    race_details: optional (race_date, venue, race_number) already parsed from url
     """
     
     try:
-        race_date, venue, race_number = parse_url(url)
+        race_date, venue, race_number = race_details or parse_url(url)
         
         print(f"Attempting to scrape odds from: {url}")
         
@@ -100,12 +117,18 @@ async def scrape_odds_with_playwright(url):
                     "page_title": page_title
                 }
                 
-                # Check if the page loaded properly
-                page_content = await page.content()
+                # Check if the page loaded properly (measured in the browser so
+                # the serialized HTML is not shipped back just to be scanned)
+                content_length, needs_js = await page.evaluate(
+                    """() => {
+                        const html = document.documentElement.outerHTML;
+                        return [html.length, html.includes('You need to enable JavaScript')];
+                    }"""
+                )
                 page_text = await page.text_content('body')
 
                 # Debug: Print some of the page content
-                print(f"Page content length: {len(page_content)}")
+                print(f"Page content length: {content_length}")
                 print(f"Page text length: {len(page_text)}")
                 print(f"First 500 characters of page text: {page_text[:500]}")
 
@@ -131,14 +154,13 @@ async def scrape_odds_with_playwright(url):
                     domains = set()
                     for req in network_requests:
                         try:
-                            from urllib.parse import urlparse
                             domain = urlparse(req['url']).netloc
                             domains.add(domain)
                         except:
                             pass
                     print(f"Unique domains accessed: {sorted(domains)}")
 
-                if "You need to enable JavaScript" in page_content:
+                if needs_js:
                     odds_data["error"] = "Page still requires JavaScript after loading"
                     odds_data["debug_content"] = page_text[:1000]  # Save some content for debugging
                     odds_data["network_requests"] = len(network_requests)
@@ -236,18 +258,11 @@ async def extract_race_info_playwright(page):
         # Get all text content and look for patterns
         page_text = await page.text_content('body')
         
-        # Look for race time patterns in the text
-        time_patterns = [
-            r'(\d{1,2}:\d{2})',
-            r'開跑時間[：:]\s*(\d{1,2}:\d{2})',
-            r'Race Time[：:]\s*(\d{1,2}:\d{2})'
-        ]
-        
-        for pattern in time_patterns:
-            match = re.search(pattern, page_text)
-            if match and 'race_time' not in race_info:
-                race_info['race_time'] = match.group(1)
-                break
+        # Look for race time patterns in the text (single scan)
+        if 'race_time' not in race_info:
+            match = _TIME_RE.search(page_text)
+            if match:
+                race_info['race_time'] = match.group(1) or match.group(2)
         
         # Look for venue information
         if '沙田' in page_text:
@@ -264,7 +279,7 @@ async def extract_race_info_playwright(page):
 async def extract_win_place_odds_playwright(page):
     """Extract Win and Place odds using Playwright"""
     try:
-        odds_data = []
+        odds_data: list[HorseOdds] = []
         
         # Look for tables that might contain odds
         tables = await page.query_selector_all('table')
@@ -288,14 +303,13 @@ async def extract_win_place_odds_playwright(page):
                                     cell_texts.append(text.strip() if text else "")
                                 
                                 # Check if first cell looks like a horse number
-                                if cell_texts[0].isdigit() and 1 <= int(cell_texts[0]) <= 14:
-                                    odds_entry = {
-                                        "horse_number": cell_texts[0],
-                                        "horse_name": cell_texts[1] if len(cell_texts) > 1 else "",
-                                        "win_odds": cell_texts[2] if len(cell_texts) > 2 else "",
-                                        "place_odds": cell_texts[3] if len(cell_texts) > 3 else ""
-                                    }
-                                    odds_data.append(odds_entry)
+                                if cell_texts[0] in VALID_HORSE_NUMS:
+                                    odds_data.append(HorseOdds(
+                                        horse_number=cell_texts[0],
+                                        horse_name=cell_texts[1] if len(cell_texts) > 1 else "",
+                                        win_odds=cell_texts[2] if len(cell_texts) > 2 else "",
+                                        place_odds=cell_texts[3] if len(cell_texts) > 3 else ""
+                                    ))
                         except:
                             continue
             except:
@@ -387,9 +401,9 @@ def save_odds_to_json(odds_data, race_date, venue, race_number):
         # Ensure the output directory exists
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         
-        # Save the data to the JSON file
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(odds_data, f, ensure_ascii=False, indent=2)
+        # Save the data to the JSON file, then atomically replace the previous
+        # snapshot so readers never see a partial file
+        write_file_atomic(json_filename, dumps_json(odds_data))
         
         print(f"Successfully saved odds data to: {json_filename}")
         return json_filename
@@ -411,12 +425,12 @@ async def main(url=None):
         print(f"Source URL: {url}")
         
         # Scrape the odds data
-        odds_data = await scrape_odds_with_playwright(url)
+        odds_data = await scrape_odds_with_playwright(url, (race_date, venue, race_number))
         
         if odds_data:
             # Print the extracted data
             print("\n--- Extracted Odds Data ---")
-            print(json.dumps(odds_data, ensure_ascii=False, indent=2))
+            print(dumps_json(odds_data).decode())
             print("---------------------------\n")
             
             # Save to JSON file
@@ -2,10 +2,10 @@ import asyncio
 import json
 import re
 import os
-import requests
 from crawlee.playwright_crawler import PlaywrightCrawler, PlaywrightCrawlingContext
 from datetime import datetime
 from dotenv import load_dotenv
+from hkjc_json_io import dumps_json, write_file_atomic
 
 # Load environment variables from .env file
 load_dotenv()
@@ -252,9 +252,9 @@ def save_odds_to_json(odds_data, race_date, venue, race_number):
         # Ensure the output directory exists
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         
-        # Save the data to the JSON file
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(odds_data, f, ensure_ascii=False, indent=2)
+        # Save the data to the JSON file, then atomically replace the previous
+        # snapshot so readers never see a partial file
+        write_file_atomic(json_filename, dumps_json(odds_data))
         
         print(f"Successfully saved odds data to: {json_filename}")
         return json_filename
@@ -1,22 +1,97 @@
+import html
 import json
 import re
 import os
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
+from hkjc_json_io import dumps_json, write_file_atomic
+
+try:
+    import ahocorasick
+except ImportError:  # fall back to the compiled keyword regex
+    ahocorasick = None
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Output directory for JSON files
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "odds_data")
+_OUTPUT_PATH = Path(OUTPUT_DIR)
+
+# YYYY-MM-DD -> YYYY_MM_DD for filenames
+_DASH_TO_UNDER = str.maketrans('-', '_')
+
+# Headers to mimic a real browser
+_SIMPLE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'zh-HK,zh;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Precompiled patterns
+_URL_WP = re.compile(r'https://bet\.hkjc\.com/ch/racing/wp/(\d{4}-\d{2}-\d{2})/(\w+)/(\d+)')
+_TIME_PATTERNS = [re.compile(p) for p in (
+    r'(\d{1,2}:\d{2})',
+    r'開跑時間[：:]\s*(\d{1,2}:\d{2})',
+    r'Race Time[：:]\s*(\d{1,2}:\d{2})'
+)]
+_ODDS_CLASS_RE = re.compile(r'odds|bet|win|place', re.I)
+
+# Keywords marking a table as odds-bearing, matched in a single regex pass
+_ODDS_KEYWORDS = ('賠率', 'odds', '獨贏', 'Win', 'Place')
+_ODDS_KEYWORD_RE = re.compile('|'.join(map(re.escape, _ODDS_KEYWORDS)))
+
+def _build_keyword_automaton(keywords):
+    """Build an Aho-Corasick automaton over keywords, or None if pyahocorasick is unavailable"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+_ODDS_KEYWORD_AUTOMATON = _build_keyword_automaton(_ODDS_KEYWORDS)
+
+def _has_odds_keyword(text):
+    """Return True if text contains any of _ODDS_KEYWORDS"""
+    if _ODDS_KEYWORD_AUTOMATON is not None:
+        return next(_ODDS_KEYWORD_AUTOMATON.iter(text), None) is not None
+    return _ODDS_KEYWORD_RE.search(text) is not None
+
+# Only the tags read by the static extractors are built into the soup
+_STRAINER_TAGS = ['title', 'h1', 'h2', 'table', 'div', 'span']
+
+# Marker served by HKJC when the page can only be rendered client-side
+_JS_GUARD = b"You need to enable JavaScript"
+_TITLE_RE = re.compile(rb'<title[^>]*>([^<]*)</title>', re.I)
+
+# Race title candidates in priority order: ('tag', name) or ('class', name)
+_TITLE_LOOKUPS = (
+    ('tag', 'h1'),
+    ('tag', 'h2'),
+    ('class', 'race-title'),
+    ('class', 'race-name'),
+    ('tag', 'title'),
+)
+
+_OUTPUT_DIR_READY = False
+
+def _ensure_output_dir():
+    """Create OUTPUT_DIR once per process"""
+    global _OUTPUT_DIR_READY
+    if not _OUTPUT_DIR_READY:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        _OUTPUT_DIR_READY = True
 
 def parse_url(url):
     """Parse HKJC odds URL to extract race details"""
     # URL format: https://bet.hkjc.com/ch/racing/wp/2025-07-01/ST/1
-    pattern = r'https://bet\.hkjc\.com/ch/racing/wp/(\d{4}-\d{2}-\d{2})/(\w+)/(\d+)'
-    match = re.match(pattern, url)
+    match = _URL_WP.match(url)
     
     if match:
         race_date = match.group(1)
@@ -26,42 +101,40 @@ def parse_url(url):
     else:
         raise ValueError(f"Invalid HKJC odds URL format: {url}")
 
-def scrape_odds_simple(url):
+def scrape_odds_simple(url, race_details=None):
     """
     Simple approach to scrape odds data using requests and BeautifulSoup
     This might not work if the page heavily relies on JavaScript
+    race_details: optional (race_date, venue, race_number) already parsed from url
     """
     
+    # Imported here so that callers only needing parse_url don't pay for the HTTP/HTML stack
+    import requests
+    from bs4 import BeautifulSoup, SoupStrainer
+    
     try:
-        race_date, venue, race_number = parse_url(url)
+        race_date, venue, race_number = race_details or parse_url(url)
         
         print(f"Attempting to scrape odds from: {url}")
         
-        # Set up headers to mimic a real browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'zh-HK,zh;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        
         # Make the request
-        response = requests.get(url, headers=headers, timeout=30)
+        response = requests.get(url, headers=_SIMPLE_HEADERS, timeout=30)
         
         if response.status_code != 200:
             print(f"Failed to fetch page: HTTP {response.status_code}")
             return None
         
-        # Parse the HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Check if the page loaded properly (not just JavaScript error)
-        if "You need to enable JavaScript" in response.text:
+        # Check if the page loaded properly (not just JavaScript error); test the
+        # raw bytes so the blocked page is never decoded or fully parsed
+        if _JS_GUARD in response.content:
             print("Page requires JavaScript - simple scraping won't work")
             print("The page content is dynamically loaded with JavaScript")
             
+            # Pull the title straight from the bytes; no HTML parse needed here
+            title_match = _TITLE_RE.search(response.content)
+            page_title = (html.unescape(title_match.group(1).decode(response.encoding or 'utf-8', errors='replace'))
+                          if title_match else "No title")
+            
             # Try to extract any static data that might be available
             odds_data = {
                 "error": "Page requires JavaScript for dynamic content",
@@ -70,12 +143,15 @@ def scrape_odds_simple(url):
                 "race_number": race_number,
                 "scraped_at": datetime.now().isoformat(),
                 "source_url": url,
-                "page_title": soup.title.string if soup.title else "No title",
+                "page_title": page_title,
                 "static_content_available": False
             }
             
             return odds_data
         
+        # Parse the HTML
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=SoupStrainer(_STRAINER_TAGS))
+        
         # If we get here, try to extract any available data
         odds_data = {
             "race_date": race_date,
@@ -122,25 +198,19 @@ def extract_static_race_info(soup):
     
     try:
         # Look for race title in various possible locations
-        title_selectors = ['h1', 'h2', '.race-title', '.race-name', 'title']
-        for selector in title_selectors:
-            element = soup.select_one(selector)
-            if element and element.get_text(strip=True):
-                race_info['title'] = element.get_text(strip=True)
+        for kind, name in _TITLE_LOOKUPS:
+            element = soup.find(name) if kind == 'tag' else soup.find(class_=name)
+            text = element.get_text(strip=True) if element else ""
+            if text:
+                race_info['title'] = text
                 break
         
         # Look for any text containing race information
         page_text = soup.get_text()
         
         # Look for race time patterns
-        time_patterns = [
-            r'(\d{1,2}:\d{2})',
-            r'開跑時間[：:]\s*(\d{1,2}:\d{2})',
-            r'Race Time[：:]\s*(\d{1,2}:\d{2})'
-        ]
-        
-        for pattern in time_patterns:
-            match = re.search(pattern, page_text)
+        for pattern in _TIME_PATTERNS:
+            match = pattern.search(page_text)
             if match:
                 race_info['race_time'] = match.group(1)
                 break
@@ -169,7 +239,7 @@ def extract_static_odds(soup):
             table_text = table.get_text()
             
             # Check if this table might contain odds
-            if any(keyword in table_text for keyword in ['賠率', 'odds', '獨贏', 'Win', 'Place']):
+            if _has_odds_keyword(table_text):
                 rows = table.find_all('tr')
                 table_data = []
                 
@@ -184,14 +254,12 @@ def extract_static_odds(soup):
                     odds_data[f'table_{i+1}'] = table_data
         
         # Look for any div or span elements that might contain odds
-        odds_elements = soup.find_all(['div', 'span'], class_=re.compile(r'odds|bet|win|place', re.I))
+        odds_elements = soup.find_all(['div', 'span'], class_=_ODDS_CLASS_RE)
         
         if odds_elements:
-            odds_texts = []
-            for element in odds_elements:
-                text = element.get_text(strip=True)
-                if text and len(text) < 100:  # Avoid very long texts
-                    odds_texts.append(text)
+            # Avoid very long texts
+            odds_texts = [text for text in (element.get_text(strip=True) for element in odds_elements)
+                          if text and len(text) < 100]
             
             if odds_texts:
                 odds_data['odds_elements'] = odds_texts
@@ -205,18 +273,14 @@ def extract_static_odds(soup):
 def save_odds_to_json(odds_data, race_date, venue, race_number):
     """Save odds data to JSON file"""
     try:
-        # Format the race date for the filename (convert from YYYY-MM-DD to YYYY_MM_DD)
-        formatted_date = race_date.replace('-', '_')
-        
-        # Create the filename
-        json_filename = f"{OUTPUT_DIR}/odds_{formatted_date}_{venue}_R{race_number}.json"
+        # Create the filename (race date converted from YYYY-MM-DD to YYYY_MM_DD)
+        json_filename = _OUTPUT_PATH / f"odds_{race_date.translate(_DASH_TO_UNDER)}_{venue}_R{race_number}.json"
         
         # Ensure the output directory exists
-        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        _ensure_output_dir()
         
         # Save the data to the JSON file
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(odds_data, f, ensure_ascii=False, indent=2)
+        write_file_atomic(json_filename, dumps_json(odds_data))
         
         print(f"Successfully saved odds data to: {json_filename}")
         return json_filename
@@ -238,7 +302,7 @@ def main(url=None):
         print(f"Source URL: {url}")
         
         # Scrape the odds data
-        odds_data = scrape_odds_simple(url)
+        odds_data = scrape_odds_simple(url, (race_date, venue, race_number))
         
         if odds_data:
             # Print the extracted data
@@ -265,7 +329,7 @@ if __name__ == '__main__':
     import sys
     
     # Create the output directory
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    _ensure_output_dir()
     
     # Check if URL is provided as command line argument
     url = None
@@ -1,25 +1,82 @@
 import json
 import re
 import os
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
+from hkjc_json_io import dumps_json, write_file_atomic
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Output directory for JSON files
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "odds_data")
+_OUTPUT_PATH = Path(OUTPUT_DIR)
+
+# YYYY-MM-DD -> YYYY_MM_DD for filenames
+_DASH_TO_UNDER = str.maketrans('-', '_')
+
+# Precompiled URL patterns
+_URL_WP = re.compile(r'https://bet\.hkjc\.com/ch/racing/wp/(\d{4}-\d{2}-\d{2})/(\w+)/(\d+)')
+_URL_PWIN = re.compile(r'https://bet\.hkjc\.com/ch/racing/pwin/(\d{4}-\d{2}-\d{2})/(\w+)/(\d+)')
+
+# Static request headers shared by every endpoint call; the per-race Referer
+# is passed on each request
+_API_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'zh-HK,zh;q=0.9,en;q=0.8',
+    'Origin': 'https://bet.hkjc.com',
+}
+
+_SESSION = None
+
+def _get_session():
+    """Return the shared HTTP session, creating it on first use.
+
+    The HTTP stack is imported here so that importing this module (e.g. just for
+    parse_url) doesn't pay for requests/requests_cache.
+    """
+    global _SESSION
+    if _SESSION is None:
+        import requests_cache
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        # Persistent HTTP cache so repeat runs don't re-hit rate-limited HKJC endpoints.
+        # Betting parameters rarely change within a race day; odds probes go stale fast.
+        session = requests_cache.CachedSession(
+            'hkjc_cache',
+            backend='sqlite',
+            expire_after=300,
+            urls_expire_after={
+                'txn01.hkjc.com/betslipIB/services/Para.svc/GetSP4EEwinPara': 86400,
+                'bet.hkjc.com/racing/getodds.aspx*': 30,
+            },
+        )
+        
+        # Reuse keep-alive connections to the HKJC hosts across all calls
+        session.headers.update(_API_HEADERS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=Retry(total=2, backoff_factor=0.3))
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _SESSION = session
+    return _SESSION
+
+_OUTPUT_DIR_READY = False
+
+def _ensure_output_dir():
+    """Create OUTPUT_DIR once per process"""
+    global _OUTPUT_DIR_READY
+    if not _OUTPUT_DIR_READY:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        _OUTPUT_DIR_READY = True
 
 def parse_url(url):
     """Parse HKJC odds URL to extract race details"""
-    patterns = [
-        r'https://bet\.hkjc\.com/ch/racing/wp/(\d{4}-\d{2}-\d{2})/(\w+)/(\d+)',
-        r'https://bet\.hkjc\.com/ch/racing/pwin/(\d{4}-\d{2}-\d{2})/(\w+)/(\d+)'
-    ]
-    
-    for pattern in patterns:
-        match = re.match(pattern, url)
+    for pattern in (_URL_WP, _URL_PWIN):
+        match = pattern.match(url)
         if match:
             race_date = match.group(1)
             venue = match.group(2)
@@ -28,23 +85,80 @@ def parse_url(url):
     
     raise ValueError(f"Invalid HKJC odds URL format: {url}")
 
+def _probe_betting_parameters(headers):
+    """Fetch betting parameters (this usually works); returns (endpoint, para_data, message)"""
+    api_url = "https://txn01.hkjc.com/betslipIB/services/Para.svc/GetSP4EEwinPara"
+    try:
+        response = _get_session().get(api_url, headers=headers, timeout=30)
+        
+        if response.status_code != 200:
+            return None, None, f"✗ Failed to get betting parameters: HTTP {response.status_code}"
+        
+        try:
+            text_data = response.text.lstrip('\ufeff')
+            para_data = json.loads(text_data)
+        except json.JSONDecodeError:
+            return None, None, "✗ Failed to parse betting parameters JSON"
+        
+        endpoint = {
+            "url": api_url,
+            "type": "betting_parameters",
+            "status": "success"
+        }
+        return endpoint, para_data, "✓ Successfully got betting parameters"
+    
+    except Exception as e:
+        return None, None, f"✗ Error getting betting parameters: {e}"
+
+def _probe_odds_endpoint(odds_type, endpoint_url, headers):
+    """Check whether an odds endpoint is accessible; returns (endpoint, None, message)"""
+    try:
+        # Only the status code matters, so skip downloading the JS-laden body
+        response = _get_session().head(endpoint_url, headers=headers, timeout=15, allow_redirects=True)
+        if response.status_code != 200:
+            return None, None, f"✗ {odds_type} endpoint returned HTTP {response.status_code}"
+        
+        endpoint = {
+            "url": endpoint_url,
+            "type": odds_type,
+            "status": "accessible_but_requires_js",
+            "note": "Returns HTML page that requires JavaScript"
+        }
+        return endpoint, None, f"✓ {odds_type} endpoint is accessible (but requires JS)"
+    
+    except Exception as e:
+        return None, None, f"✗ Error checking {odds_type} endpoint: {e}"
+
+def _probe_race_information(race_info_url, headers):
+    """Check whether the racecard page is accessible; returns (endpoint, None, message)"""
+    try:
+        # Only the status code matters, so skip downloading the page body
+        response = _get_session().head(race_info_url, headers=headers, timeout=15, allow_redirects=True)
+        if response.status_code != 200:
+            return None, None, f"✗ Race information page returned HTTP {response.status_code}"
+        
+        endpoint = {
+            "url": race_info_url,
+            "type": "race_information",
+            "status": "success"
+        }
+        return endpoint, None, "✓ Race information page is accessible"
+    
+    except Exception as e:
+        return None, None, f"✗ Error getting race information: {e}"
+
 def get_hkjc_data(race_date, venue, race_number):
     """Get available data from HKJC for the specified race"""
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'application/json, text/plain, */*',
-        'Accept-Language': 'zh-HK,zh;q=0.9,en;q=0.8',
-        'Referer': f'https://bet.hkjc.com/ch/racing/pwin/{race_date}/{venue}/{race_number}',
-        'Origin': 'https://bet.hkjc.com',
-    }
+    source_url = f"https://bet.hkjc.com/ch/racing/pwin/{race_date}/{venue}/{race_number}"
+    headers = {'Referer': source_url}
     
     result = {
         "race_info": {
             "race_date": race_date,
             "venue": venue,
             "race_number": race_number,
-            "source_url": f"https://bet.hkjc.com/ch/racing/pwin/{race_date}/{venue}/{race_number}",
+            "source_url": source_url,
             "scraped_at": datetime.now().isoformat()
         },
         "betting_parameters": None,
@@ -63,74 +177,39 @@ def get_hkjc_data(race_date, venue, race_number):
         }
     }
     
-    # 1. Try to get betting parameters (this usually works)
-    print("Getting betting parameters...")
-    try:
-        api_url = "https://txn01.hkjc.com/betslipIB/services/Para.svc/GetSP4EEwinPara"
-        response = requests.get(api_url, headers=headers, timeout=30)
-        
-        if response.status_code == 200:
-            try:
-                text_data = response.text.lstrip('\ufeff')
-                para_data = json.loads(text_data)
-                result["betting_parameters"] = para_data
-                result["summary"]["betting_parameters_available"] = True
-                result["available_endpoints"].append({
-                    "url": api_url,
-                    "type": "betting_parameters",
-                    "status": "success"
-                })
-                print("✓ Successfully got betting parameters")
-            except json.JSONDecodeError:
-                print("✗ Failed to parse betting parameters JSON")
-        else:
-            print(f"✗ Failed to get betting parameters: HTTP {response.status_code}")
-            
-    except Exception as e:
-        print(f"✗ Error getting betting parameters: {e}")
+    race_info_url = f"https://racing.hkjc.com/racing/information/Chinese/Racing/Racecard.aspx?RaceDate={race_date.replace('-', '/')}&Racecourse={venue}&RaceNo={race_number}"
     
-    # 2. Check if odds endpoints are accessible (they usually return HTML due to JS requirements)
-    print("Checking odds endpoints...")
-    odds_endpoints = [
-        ("win_odds", f"https://bet.hkjc.com/racing/getodds.aspx?type=win&date={race_date}&venue={venue}&raceno={race_number}"),
-        ("place_odds", f"https://bet.hkjc.com/racing/getodds.aspx?type=pla&date={race_date}&venue={venue}&raceno={race_number}")
+    # 1-3. Probe betting parameters, odds endpoints and race information concurrently
+    # (odds endpoints usually return HTML due to JS requirements)
+    print("Probing HKJC endpoints...")
+    probes = [
+        ("betting_parameters", _probe_betting_parameters, ()),
+        ("win_odds", _probe_odds_endpoint, ("win_odds", f"https://bet.hkjc.com/racing/getodds.aspx?type=win&date={race_date}&venue={venue}&raceno={race_number}")),
+        ("place_odds", _probe_odds_endpoint, ("place_odds", f"https://bet.hkjc.com/racing/getodds.aspx?type=pla&date={race_date}&venue={venue}&raceno={race_number}")),
+        ("race_information", _probe_race_information, (race_info_url,)),
     ]
     
-    for odds_type, endpoint in odds_endpoints:
-        try:
-            response = requests.get(endpoint, headers=headers, timeout=15)
-            if response.status_code == 200:
-                result["available_endpoints"].append({
-                    "url": endpoint,
-                    "type": odds_type,
-                    "status": "accessible_but_requires_js",
-                    "note": "Returns HTML page that requires JavaScript"
-                })
-                print(f"✓ {odds_type} endpoint is accessible (but requires JS)")
-            else:
-                print(f"✗ {odds_type} endpoint returned HTTP {response.status_code}")
-        except Exception as e:
-            print(f"✗ Error checking {odds_type} endpoint: {e}")
-    
-    # 3. Try to get race information from the racing site
-    print("Getting race information...")
-    try:
-        race_info_url = f"https://racing.hkjc.com/racing/information/Chinese/Racing/Racecard.aspx?RaceDate={race_date.replace('-', '/')}&Racecourse={venue}&RaceNo={race_number}"
-        response = requests.get(race_info_url, headers=headers, timeout=15)
-        
-        if response.status_code == 200:
-            result["available_endpoints"].append({
-                "url": race_info_url,
-                "type": "race_information",
-                "status": "success"
-            })
-            result["summary"]["race_info_available"] = True
-            print("✓ Race information page is accessible")
-        else:
-            print(f"✗ Race information page returned HTTP {response.status_code}")
-            
-    except Exception as e:
-        print(f"✗ Error getting race information: {e}")
+    # Create the shared session up front so the worker threads don't race to build it
+    _get_session()
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        futures = {executor.submit(probe, *args, headers): name for name, probe, args in probes}
+        for future in as_completed(futures):
+            outcomes[futures[future]] = future.result()
+    
+    # Report in a stable order regardless of completion order
+    for name, _, _ in probes:
+        endpoint, _, message = outcomes[name]
+        print(message)
+        if endpoint:
+            result["available_endpoints"].append(endpoint)
+    
+    para_data = outcomes["betting_parameters"][1]
+    if para_data is not None:
+        result["betting_parameters"] = para_data
+        result["summary"]["betting_parameters_available"] = True
+    if outcomes["race_information"][0]:
+        result["summary"]["race_info_available"] = True
     
     # 4. Update summary
     result["summary"]["data_extraction_successful"] = any([
@@ -157,13 +236,11 @@ def get_hkjc_data(race_date, venue, race_number):
 def save_data_to_json(data, race_date, venue, race_number):
     """Save the consolidated data to JSON file"""
     try:
-        formatted_date = race_date.replace('-', '_')
-        json_filename = f"{OUTPUT_DIR}/hkjc_data_{formatted_date}_{venue}_R{race_number}.json"
+        json_filename = _OUTPUT_PATH / f"hkjc_data_{race_date.translate(_DASH_TO_UNDER)}_{venue}_R{race_number}.json"
         
-        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        _ensure_output_dir()
         
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        write_file_atomic(json_filename, dumps_json(data))
         
         print(f"Successfully saved data to: {json_filename}")
         return json_filename
@@ -229,7 +306,7 @@ def main(url=None):
 if __name__ == '__main__':
     import sys
     
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    _ensure_output_dir()
     
     url = None
     if len(sys.argv) > 1:
@@ -1,13 +1,38 @@
 import asyncio
+import heapq
 import json
+import logging
 import re
 import os
+import sys
 import requests
-from crawlee.beautifulsoup_crawler import BeautifulSoupCrawler, BeautifulSoupCrawlingContext
+from requests.adapters import HTTPAdapter
+from crawlee import ConcurrencySettings
+from crawlee.http_crawler import HttpCrawler, HttpCrawlingContext
 from pocketbase import PocketBase
 from datetime import datetime
+from operator import itemgetter
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from types import MappingProxyType
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
+from hkjc_json_io import dumps_json, write_file_atomic
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:  # fall back to the compiled keyword regex
+    ahocorasick = None
+
+try:
+    import uvloop
+except ImportError:  # not installed, or Windows (unsupported); use the default loop
+    uvloop = None
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,9 +43,242 @@ POCKETBASE_EMAIL = os.getenv("POCKETBASE_EMAIL")
 POCKETBASE_PASSWORD = os.getenv("POCKETBASE_PASSWORD")
 COLLECTION_NAME = os.getenv("POCKETBASE_RESULTS_COLLECTION", "race_results")
 
+# Races sent per PocketBase batch request (at least 1)
+PB_BATCH_SIZE = max(1, int(os.getenv("POCKETBASE_BATCH_SIZE", "50")))
+
+# Results pages the crawler fetches in parallel (at least 1)
+RACE_CONCURRENCY = max(1, int(os.getenv("RACE_CONCURRENCY", "8")))
+
 # Output directory for JSON files
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "race_results_data")
 
+# Directory of consolidated per-race JSON files; these double as the extraction cache
+PERFORMANCE_DIR = "performance_data"
+
+# Results pages for races at least this many days old are settled, so previously
+# extracted data is reused instead of re-scraping (set to a negative value to disable)
+RESULTS_CACHE_MIN_AGE_DAYS = int(os.getenv("RESULTS_CACHE_MIN_AGE_DAYS", "7"))
+
+# Stamped into each performance JSON; files written by another version of the
+# extractor (or before the stamp existed) are never reused. Bump this whenever
+# extract_race_results changes what it produces.
+RESULTS_EXTRACTOR_VERSION = 1
+
+# Shown by HKJC in place of results for a date/race that doesn't exist ("沒有相關資料"),
+# as UTF-8 bytes so it can be tested before the page is parsed
+_NO_DATA_SENTINEL = "沒有相關資料".encode('utf-8')
+
+# Everything extracted from a results page (race header, results, timings, payouts,
+# incident report) sits inside <table> elements; navigation, scripts and the rest
+# of the page chrome are never read, so they aren't built into the soup
+_RESULTS_STRAINER = SoupStrainer('table')
+
+# Precompiled race information patterns
+_RACE_NUM_RE = re.compile(r'第\s*(\d+)\s*場')
+_DIST_RE = re.compile(r'(\d+)米')
+_RATING_RE = re.compile(r'\(([0-9-]+)\)')
+
+# Precompiled results table / timing patterns
+_HORSE_NAME_RE = re.compile(r'(.+?)\s*\(([^)]+)\)')
+_PAREN_STRIP_RE = re.compile(r'\s*\([^)]+\)')
+_FINAL_TIME_RE = re.compile(r'\(([0-9:]+\.[0-9]+)\)$')
+_SECTIONAL_RE = re.compile(r'([0-9.]+)')
+# A number float() accepts: digits with at most one decimal point
+_FLOAT_RE = re.compile(r'\A(?:\d+\.?\d*|\.\d+)\Z')
+_DIGIT_RE = re.compile(r'\d')
+_RACE_TIMES_RE = re.compile(r'\(([0-9:.]+)\)')
+_MARGIN_LENGTHS_RE = re.compile(r'(\d+(?:-\d+/\d+)?)')
+
+# Margins that count as a close finish (short head, head, 1/2, 1/4 length); the
+# field analysis also counts a neck (頸), the race statistics don't
+_CLOSE_FINISH_KEYWORDS = ('短', '頭', '1/2', '1/4')
+_CLOSE_MARGIN_KEYWORDS = _CLOSE_FINISH_KEYWORDS + ('頸',)
+_CLOSE_FINISH_RE = re.compile('|'.join(map(re.escape, _CLOSE_FINISH_KEYWORDS)))
+_CLOSE_MARGIN_RE = re.compile('|'.join(map(re.escape, _CLOSE_MARGIN_KEYWORDS)))
+_CLASS_NUMBER_RE = re.compile(r'第([一二三四五])班')
+_CLASS_NUMBERS = {"一": 1, "二": 2, "三": 3, "四": 4, "五": 5}
+
+# All race class kinds in one alternation; each named group is one kind
+_CLASS_RE = re.compile(
+    r'第(?P<c>[一二三四五])班|(?P<g>[一二三])級賽|(?P<listed>表列賽)'
+    r'|(?P<maiden>新馬)|(?P<handicap>讓賽)|(?P<age>[二三四五])歲'
+)
+
+# Race class templates keyed by _CLASS_RE group name, filled with the group's text
+_CLASS_TABLE = {
+    'c': '第{}班',
+    'g': '{}級賽',
+    'listed': '表列賽',
+    'maiden': '新馬賽',
+    'handicap': '讓賽',
+    'age': '{}歲',
+}
+
+# Rank of each kind when a text names more than one (lower wins)
+_CLASS_PRIORITY = {kind: rank for rank, kind in enumerate(_CLASS_TABLE)}
+
+# Race-related keywords a class/distance line must contain; the fallback accepts a broader set
+_RACE_INFO_KEYWORD_RE = re.compile('班|級賽|新馬|讓賽|歲')
+_FALLBACK_KEYWORD_RE = re.compile('班|賽|新馬|讓|級|歲')
+
+# Section labels read by the sectional, payout and performance extractors
+_PAGE_LABELS = ('時間', '分段時間', '場地狀況', '派彩')
+
+# Labels whose text node (or its next sibling) holds a race info value
+_RACE_INFO_LABELS = ('場地狀況', '賽道', 'HK$')
+
+# Pools named in the first cell of a payout row; exotic pools (孖寶, 孖T) vary in
+# name, so they are matched by substring
+_STANDARD_POOLS = frozenset(('獨贏', '位置', '連贏', '位置Q', '二重彩', '三重彩', '單T', '四連環', '四重彩'))
+_EXOTIC_PATTERNS = ('孖寶', '孖T', '口孖')
+_STANDARD_POOL_RE = re.compile('|'.join(map(re.escape, _STANDARD_POOLS)))
+
+# A payout row's first cell names a new bet type if it is exactly a standard pool
+# or contains an exotic pool pattern
+_BET_TYPE_RE = re.compile(
+    r'\A(?:' + '|'.join(map(re.escape, _STANDARD_POOLS)) + r')\Z|'
+    + '|'.join(map(re.escape, _EXOTIC_PATTERNS))
+)
+
+# Header cells of a payout table
+_PAYOUT_HEADER_CELLS = frozenset(('彩池', '勝出組合'))
+_PAYOUT_HEADER_AMOUNTS = frozenset(('派彩 (HK$)', '派彩'))
+
+# Stand-in for a horse without performance metrics; read-only so it can be shared
+_NO_METRICS = MappingProxyType({})
+
+# Horse performance rating bands: win odds up to 3.0 / 6.0 / 15.0, finishing
+# position 1 / up to 3 / up to 6 (bisect_left, so each bound is inclusive), and
+# carried weight from 120 / 130 lb (bisect_right, so each bound starts a band)
+_ODDS_RATING_BOUNDS = (3.0, 6.0, 15.0)
+_ODDS_RATINGS = ("strong_favorite", "favorite", "competitive", "outsider")
+_RESULT_RATING_BOUNDS = (1, 3, 6)
+_RESULT_RATINGS = ("winner", "placed", "competitive", "unplaced")
+_WEIGHT_RATING_BOUNDS = (120, 130)
+_WEIGHT_RATINGS = ("light", "moderate", "heavy")
+
+# Standard winning times (seconds) by distance (m), used for the race speed rating
+_STANDARD_DISTANCES = (1000, 1200, 1400, 1600, 1800, 2000)
+_STANDARD_TIMES = (57.0, 69.0, 81.0, 93.0, 105.0, 117.0)
+
+# Wording that marks a text as part of an incident report rather than race info
+_INCIDENT_KEYWORDS = ("發生碰撞", "被警告", "須抽取樣本", "接受獸醫檢查", "賽後", "騎師", "練馬師")
+_INCIDENT_RE = re.compile('|'.join(map(re.escape, _INCIDENT_KEYWORDS)))
+
+# Incident report positions for horses that didn't finish (withdrawn, did not finish)
+_SPECIAL_POSITIONS = frozenset(('WV', 'DNF'))
+
+# Wording that marks a table (and its rows) as the stewards' incident report
+_INCIDENT_REPORT_KEYWORDS = (
+    '競賽事件報告', '競賽事件', '賽後須抽取樣本檢驗',
+    '出閘笨拙', '內閃', '獸醫檢查', '煩躁不安', '出閘僅屬一般'
+)
+_INCIDENT_REPORT_RE = re.compile('|'.join(map(re.escape, _INCIDENT_REPORT_KEYWORDS)))
+
+# Stewards' report wording for the incident types that match on several phrases
+_STARTING_KEYWORDS = ("出閘笨拙", "出閘緩慢")
+_RUNNING_LINE_KEYWORDS = ("向外斜跑", "向內斜跑", "斜跑")
+_INTERFERENCE_KEYWORDS = ("受擠迫", "被碰撞", "碰撞")
+_BLOCKED_KEYWORDS = ("收慢", "未能望空")
+
+# Stewards' report wording by incident severity, checked from high to low
+_HIGH_SEVERITY_KEYWORDS = ("流鼻血", "必須試閘及格", "小組譴責", "表現令人失望")
+_MEDIUM_SEVERITY_KEYWORDS = ("受擠迫", "被碰撞", "收慢", "出閘笨拙", "出閘緩慢")
+_LOW_SEVERITY_KEYWORDS = ("抽取樣本檢驗", "獸醫檢查", "向外斜跑", "向內斜跑")
+
+# Incident types in priority order, each with the keywords that identify it
+_INCIDENT_TYPE_RULES = (
+    (("抽取樣本檢驗",), "post_race_testing"),
+    (("獸醫檢查",), "veterinary_examination"),
+    (("試閘及格",), "barrier_trial_required"),
+    (("流鼻血",), "bleeding"),
+    (("小組譴責",), "stewards_reprimand"),
+    (_STARTING_KEYWORDS, "starting_issues"),
+    (_RUNNING_LINE_KEYWORDS, "running_wide_or_in"),
+    (_INTERFERENCE_KEYWORDS, "interference"),
+    (_BLOCKED_KEYWORDS, "blocked_or_checked"),
+    (("煩躁不安",), "fractious_in_gates"),
+    (("表現令人失望",), "disappointing_performance"),
+)
+_SEVERITY_RULES = (
+    (_HIGH_SEVERITY_KEYWORDS, "high"),
+    (_MEDIUM_SEVERITY_KEYWORDS, "medium"),
+    (_LOW_SEVERITY_KEYWORDS, "low"),
+)
+
+# Every keyword either rule set looks for, found in a single scan of a report.
+# Keywords overlap (斜跑 sits inside 向外斜跑, 碰撞 inside 被碰撞), so the regex
+# fallback matches at every position via a lookahead; this finds them all
+# because no keyword is a prefix of another.
+_REPORT_KEYWORDS = tuple(dict.fromkeys(
+    keyword for rules in (_INCIDENT_TYPE_RULES, _SEVERITY_RULES)
+    for rule_keywords, _ in rules for keyword in rule_keywords
+))
+_REPORT_KEYWORD_RE = re.compile('(?=(' + '|'.join(map(re.escape, _REPORT_KEYWORDS)) + '))')
+
+def _build_keyword_automaton(keywords):
+    """Build an Aho-Corasick automaton over keywords, or None if pyahocorasick is unavailable"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+_REPORT_KEYWORD_AUTOMATON = _build_keyword_automaton(_REPORT_KEYWORDS)
+_CLOSE_FINISH_AUTOMATON = _build_keyword_automaton(_CLOSE_FINISH_KEYWORDS)
+_CLOSE_MARGIN_AUTOMATON = _build_keyword_automaton(_CLOSE_MARGIN_KEYWORDS)
+
+def _has_keyword(text, automaton, pattern):
+    """Return True if text contains any keyword, using automaton when available, else pattern"""
+    if automaton is not None:
+        return next(automaton.iter(text), None) is not None
+    return pattern.search(text) is not None
+
+def _match_race_class(text):
+    """Return the highest-priority race class named in text, or None."""
+    best = None
+    for match in _CLASS_RE.finditer(text):
+        if best is None or _CLASS_PRIORITY[match.lastgroup] < _CLASS_PRIORITY[best.lastgroup]:
+            best = match
+    if best is None:
+        return None
+    return _CLASS_TABLE[best.lastgroup].format(best.group(best.lastgroup))
+
+def _first_texts_containing(text_nodes, labels):
+    """Return {label: first text node containing it} from a single pass over text_nodes."""
+    found = {}
+    for text in text_nodes:
+        for label in labels:
+            if label not in found and label in text:
+                found[label] = text
+        if len(found) == len(labels):
+            break
+    return found
+
+def _iter_text_nodes(soup):
+    """Yield the document's text nodes lazily, in document order."""
+    return (node for node in soup.descendants if isinstance(node, NavigableString))
+
+# Elements that group a table's rows
+_ROW_GROUPS = frozenset(('thead', 'tbody', 'tfoot'))
+
+def _table_rows(table):
+    """Return a table's own <tr> rows, directly or in thead/tbody/tfoot, in document order.
+
+    Only the table's children and row groups are visited, so cell contents and
+    nested tables aren't walked. Falls back to every <tr> below the table if it
+    has no rows of its own (malformed markup).
+    """
+    rows = []
+    for child in table.find_all(True, recursive=False):
+        if child.name == 'tr':
+            rows.append(child)
+        elif child.name in _ROW_GROUPS:
+            rows.extend(child.find_all('tr', recursive=False))
+    return rows or table.find_all('tr')
+
 def construct_results_url(race_date, racecourse, race_no):
     """
     Construct the HKJC race results URL with variable parameters.
@@ -36,6 +294,48 @@ def construct_results_url(race_date, racecourse, race_no):
     base_url = "https://racing.hkjc.com/racing/information/Chinese/Racing/LocalResults.aspx"
     return f"{base_url}?RaceDate={race_date}&Racecourse={racecourse}&RaceNo={race_no}"
 
+_PB_SESSION = None
+_PB_TOKEN = None
+
+def _get_pb_session():
+    """Return the shared PocketBase HTTP session, creating it on first use."""
+    global _PB_SESSION
+    if _PB_SESSION is None:
+        # Keep-alive connections so repeat calls skip the TCP/TLS handshake
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _PB_SESSION = session
+    return _PB_SESSION
+
+def _get_pb_token(refresh=False):
+    """
+    Return a PocketBase auth token, logging in only when none is cached.
+    
+    Args:
+        refresh (bool): Discard the cached token and log in again (e.g. after a 401)
+    
+    Returns:
+        str: Auth token, or None if the login failed
+    """
+    global _PB_TOKEN
+    if _PB_TOKEN is None or refresh:
+        login_data = {
+            "identity": POCKETBASE_EMAIL,
+            "password": POCKETBASE_PASSWORD
+        }
+        
+        login_response = _get_pb_session().post(f"{POCKETBASE_URL}/api/collections/users/auth-with-password", json=login_data)
+        
+        if login_response.status_code != 200:
+            print(f"Failed to login to PocketBase: {login_response.text}")
+            _PB_TOKEN = None
+            return None
+        
+        _PB_TOKEN = login_response.json()["token"]
+    return _PB_TOKEN
+
 def ensure_results_collection_exists():
     """
     Ensure the PocketBase collection for race results exists.
@@ -43,26 +343,17 @@ def ensure_results_collection_exists():
     """
     try:
         # Check if collection exists
-        response = requests.get(f"{POCKETBASE_URL}/api/collections/{COLLECTION_NAME}")
+        session = _get_pb_session()
+        response = session.get(f"{POCKETBASE_URL}/api/collections/{COLLECTION_NAME}")
         
         if response.status_code == 404:
             print(f"Collection '{COLLECTION_NAME}' does not exist. Creating...")
             
-            # Login to PocketBase admin
-            login_data = {
-                "identity": POCKETBASE_EMAIL,
-                "password": POCKETBASE_PASSWORD
-            }
-            
-            login_response = requests.post(f"{POCKETBASE_URL}/api/collections/users/auth-with-password", json=login_data)
-            
-            if login_response.status_code != 200:
-                print(f"Failed to login to PocketBase: {login_response.text}")
+            # Login to PocketBase admin (reuses the cached token when there is one)
+            token = _get_pb_token()
+            if not token:
                 return False
             
-            token = login_response.json()["token"]
-            headers = {"Authorization": f"Bearer {token}"}
-            
             # Create collection schema for race results
             collection_data = {
                 "name": COLLECTION_NAME,
@@ -86,7 +377,16 @@ def ensure_results_collection_exists():
                 ]
             }
             
-            create_response = requests.post(f"{POCKETBASE_URL}/api/collections", json=collection_data, headers=headers)
+            create_response = session.post(f"{POCKETBASE_URL}/api/collections", json=collection_data,
+                                           headers={"Authorization": f"Bearer {token}"})
+            
+            # A cached token may have expired; log in again and retry once
+            if create_response.status_code == 401:
+                token = _get_pb_token(refresh=True)
+                if not token:
+                    return False
+                create_response = session.post(f"{POCKETBASE_URL}/api/collections", json=collection_data,
+                                               headers={"Authorization": f"Bearer {token}"})
             
             if create_response.status_code == 200 or create_response.status_code == 201:
                 print(f"Collection '{COLLECTION_NAME}' created successfully!")
@@ -113,55 +413,96 @@ async def scrape_race_results(race_date, racecourse, race_no):
     Returns:
         dict: Extracted race results data or None if no data found
     """
-    target_url = construct_results_url(race_date, racecourse, race_no)
-    print(f"Scraping race results from: {target_url}")
+    results_by_race = await scrape_races_results(race_date, racecourse, [race_no])
+    return results_by_race[race_no]
+
+async def scrape_races_results(race_date, racecourse, race_numbers):
+    """
+    Scrape race results for several races of one meeting with a single crawler.
     
-    # Create a BeautifulSoupCrawler instance
-    crawler = BeautifulSoupCrawler()
+    Args:
+        race_date (str): Race date in format YYYY/MM/DD
+        racecourse (str): Racecourse code ("ST" or "HV")
+        race_numbers (list): List of race numbers to scrape
     
-    results_data = None
+    Returns:
+        dict: Race number -> extracted race results data (None if no data found)
+    """
+    # Settled races that were already extracted are served from disk
+    results_by_race = {race_no: load_cached_results(race_date, racecourse, race_no) for race_no in race_numbers}
     
-    # Define a request handler to process the page
+    race_by_url = {construct_results_url(race_date, racecourse, race_no): race_no
+                   for race_no in race_numbers if results_by_race[race_no] is None}
+    if not race_by_url:
+        return results_by_race
+    for target_url in race_by_url:
+        print(f"Scraping race results from: {target_url}")
+    
+    # One crawler for the whole batch so pages are fetched concurrently over a
+    # shared connection pool. Every page is on the same HKJC host, so concurrency
+    # is capped to stay clear of its rate limiting. An HttpCrawler is used rather
+    # than a BeautifulSoupCrawler so pages without results are rejected from the
+    # raw bytes, before any parsing.
+    crawler = HttpCrawler(
+        concurrency_settings=ConcurrencySettings(desired_concurrency=RACE_CONCURRENCY, max_concurrency=RACE_CONCURRENCY),
+    )
+    
+    # Define a request handler to process each page
     @crawler.router.default_handler
-    async def request_handler(context: BeautifulSoupCrawlingContext) -> None:
-        nonlocal results_data
+    async def request_handler(context: HttpCrawlingContext) -> None:
+        race_no = race_by_url[context.request.url]
         context.log.info(f'Processing {context.request.url} ...')
+        soup = None
         
         try:
             # Check if page has results data
-            if "沒有相關資料" in context.soup.get_text():
+            body = context.http_response.read()
+            if _NO_DATA_SENTINEL in body:
                 context.log.info("No race data found for this date/race combination")
-                results_data = None
                 return
             
+            # Parse with lxml, which is much faster than html.parser on these
+            # table-heavy pages, building only the tables the extractors read
+            soup = BeautifulSoup(body, 'lxml', parse_only=_RESULTS_STRAINER)
+            
             # Extract race results
-            results_data = extract_race_results(context, race_date, racecourse, race_no)
+            results_data = extract_race_results(soup, race_date, racecourse, race_no)
+            results_by_race[race_no] = results_data
             
             if results_data:
                 # Store the extracted data
                 await context.push_data(results_data)
                 
-                # Print the extracted information
-                print("\n--- Extracted Race Results ---")
-                print(json.dumps(results_data, ensure_ascii=False, indent=2))
-                print("------------------------------\n")
+                # Dump the extracted information at debug level only; serializing the
+                # whole race dict is skipped unless debug logging is enabled
+                if context.log.isEnabledFor(logging.DEBUG):
+                    if orjson is not None:
+                        dumped = orjson.dumps(results_data, option=orjson.OPT_INDENT_2).decode()
+                    else:
+                        dumped = json.dumps(results_data, ensure_ascii=False, indent=2)
+                    context.log.debug(f"Extracted race results:\n{dumped}")
             
-        except Exception as e:
-            context.log.error(f"Error extracting race results: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            context.log.exception("Error extracting race results")
+        
+        finally:
+            # Everything needed has been copied out of the tree by now. Tear it down
+            # so its parent/child reference cycles are freed straight away rather
+            # than piling up until the cyclic GC runs during a long backfill.
+            if soup is not None:
+                soup.decompose()
     
-    # Run the crawler with the target URL
-    await crawler.run([target_url])
+    # Run the crawler once with every target URL
+    await crawler.run(list(race_by_url))
     
-    return results_data
+    return results_by_race
 
-def extract_race_results(context, race_date, racecourse, race_no):
+def extract_race_results(soup, race_date, racecourse, race_no):
     """
-    Extract race results from the BeautifulSoup context.
+    Extract race results from a parsed results page.
     
     Args:
-        context: BeautifulSoupCrawlingContext
+        soup (BeautifulSoup): Parsed results page
         race_date (str): Race date
         racecourse (str): Racecourse code
         race_no (int): Race number
@@ -170,25 +511,37 @@ def extract_race_results(context, race_date, racecourse, race_no):
         dict: Structured race results data
     """
     try:
-        soup = context.soup
+        # Walk the document for tables once; every table-based extractor reuses the list
+        tables = soup.find_all('table')
+        
+        # Likewise read the results table's cell texts once for every row-based extractor
+        # (kept per table too, for the statistics that only read the first results table)
+        results_rows_by_table = [_extract_results_rows([table]) for table in tables]
+        results_rows = [texts for rows in results_rows_by_table for texts in rows]
+        
+        # ...and each table's text once for the extractors that pick tables by keyword
+        table_texts = [table.get_text() for table in tables]
+        
+        # ...and locate every section label in a single pass over the text nodes
+        label_texts = _first_texts_containing(_iter_text_nodes(soup), _PAGE_LABELS)
         
         # Extract basic race information
         race_info = extract_race_info_from_results(soup)
         
         # Extract finishing positions and horse details
-        results = extract_finishing_positions(soup)
+        results = extract_finishing_positions(soup, tables, results_rows)
         
         # Extract sectional times
-        sectional_times = extract_sectional_times(soup)
+        sectional_times = extract_sectional_times(soup, tables, results_rows, label_texts)
         
         # Extract payouts
-        payouts = extract_payouts(soup)
+        payouts = extract_payouts(soup, tables, label_texts, table_texts)
         
         # Extract race incidents/reports
-        incidents = extract_race_incidents(soup)
+        incidents = extract_race_incidents(soup, tables, table_texts)
 
         # Extract performance data (pass fixed sectional times)
-        performance_data = extract_performance_data(soup, results, sectional_times)
+        performance_data = extract_performance_data(soup, results, sectional_times, tables, label_texts, results_rows_by_table)
 
         # Generate field analysis from performance data
         field_analysis = generate_field_analysis(performance_data.get('horse_performance', []))
@@ -220,85 +573,55 @@ def extract_race_info_from_results(soup):
 
     try:
         # Look for race title and details
-        # The race information is split across multiple text elements
-        race_text_elements = soup.find_all(text=True)
-
+        # The race information is split across multiple text elements; a single
+        # sweep over the text nodes finds the race number line, collects the
+        # class/distance candidates and picks up the label nodes read further down
         race_number_text = ""
         race_class_distance_text = ""
+        distance_texts = []
+        label_texts = {}
 
-        # Find race number text (e.g., "第 9 場 (725)")
-        for text in race_text_elements:
-            text_str = str(text).strip()
-            if re.search(r'第\s*\d+\s*場', text_str):
-                race_number_text = text_str
-                race_info["race_number_text"] = race_number_text
+        for text in _iter_text_nodes(soup):
+            text_str = text.strip()
 
-                # Extract race number
-                race_num_match = re.search(r'第\s*(\d+)\s*場', text_str)
+            # Find race number text (e.g., "第 9 場 (725)"); the substring test
+            # skips the regex for almost every node
+            if not race_number_text and "場" in text_str:
+                race_num_match = _RACE_NUM_RE.search(text_str)
                 if race_num_match:
+                    race_number_text = text_str
+                    race_info["race_number_text"] = race_number_text
                     race_info["race_number"] = race_num_match.group(1)
-                break
+
+            # Only short texts mentioning a distance (米) can hold the class/distance
+            # line (long ones are incident reports)
+            if len(text_str) < 100 and "米" in text_str:
+                distance_texts.append(text_str)
+
+            for label in _RACE_INFO_LABELS:
+                if label not in label_texts and label in text:
+                    label_texts[label] = text
 
         # Find class/distance text (e.g., "第三班 - 1400米 - (80-60)" or "一級賽 - 2000米" or "四歲 - 1800米")
-        for text in race_text_elements:
-            text_str = str(text).strip()
+        for text_str in distance_texts:
             # Enhanced pattern matching for different race types
-            # Check for valid race info patterns and exclude incident reports
-            is_valid_race_info = False
-
-            # Pattern 1: Contains distance (米) and race-related keywords
-            if "米" in text_str and len(text_str) < 100:  # Exclude long incident reports
-                # Valid race info patterns
-                if any(pattern in text_str for pattern in ["班", "級賽", "新馬", "讓賽", "歲"]):
-                    # Exclude incident report patterns
-                    incident_keywords = ["發生碰撞", "被警告", "須抽取樣本", "接受獸醫檢查", "賽後", "騎師", "練馬師"]
-                    if not any(keyword in text_str for keyword in incident_keywords):
-                        is_valid_race_info = True
-
-            if is_valid_race_info:
+            # Valid race info contains a race-related keyword and no incident report wording
+            if _RACE_INFO_KEYWORD_RE.search(text_str) and not _INCIDENT_RE.search(text_str):
                 race_class_distance_text = text_str
                 race_info["class_distance_text"] = race_class_distance_text
 
                 # Extract race class - Enhanced to handle multiple race types
-                race_class = None
-
-                # Pattern 1: Regular class races (第一班, 第二班, etc.)
-                class_match = re.search(r'第([一二三四五])班', text_str)
-                if class_match:
-                    race_class = f"第{class_match.group(1)}班"
-
-                # Pattern 2: Group races (一級賽, 二級賽, 三級賽)
-                elif re.search(r'([一二三])級賽', text_str):
-                    group_match = re.search(r'([一二三])級賽', text_str)
-                    race_class = f"{group_match.group(1)}級賽"
-
-                # Pattern 3: Listed races (表列賽)
-                elif "表列賽" in text_str:
-                    race_class = "表列賽"
-
-                # Pattern 4: Maiden races (新馬賽)
-                elif "新馬" in text_str:
-                    race_class = "新馬賽"
-
-                # Pattern 5: Other special races (handicap, etc.)
-                elif "讓賽" in text_str:
-                    race_class = "讓賽"
-
-                # Pattern 6: Age-restricted races (四歲, 三歲, etc.)
-                elif re.search(r'([二三四五])歲', text_str):
-                    age_match = re.search(r'([二三四五])歲', text_str)
-                    race_class = f"{age_match.group(1)}歲"
-
+                race_class = _match_race_class(text_str)
                 if race_class:
                     race_info["race_class"] = race_class
 
                 # Extract distance
-                distance_match = re.search(r'(\d+)米', text_str)
+                distance_match = _DIST_RE.search(text_str)
                 if distance_match:
                     race_info["distance"] = f"{distance_match.group(1)}米"
 
                 # Extract rating range (for class races)
-                rating_match = re.search(r'\(([0-9-]+)\)', text_str)
+                rating_match = _RATING_RE.search(text_str)
                 if rating_match:
                     race_info["rating_range"] = rating_match.group(1)
 
@@ -307,46 +630,27 @@ def extract_race_info_from_results(soup):
         # Fallback: If no class/distance found, try broader search
         if not race_info.get("class_distance_text"):
             print(f"   ⚠️  No class/distance found with primary method, trying fallback...")
-            for text in race_text_elements:
-                text_str = str(text).strip()
-                # Look for any text containing distance (米) that might be race info
-                if "米" in text_str and len(text_str) > 3 and len(text_str) < 100:
-                    # Check if it contains race-related keywords
-                    race_keywords = ["班", "賽", "新馬", "讓", "級", "歲"]
-                    # Exclude incident report patterns
-                    incident_keywords = ["發生碰撞", "被警告", "須抽取樣本", "接受獸醫檢查", "賽後", "騎師", "練馬師"]
-
-                    if (any(keyword in text_str for keyword in race_keywords) and
-                        not any(keyword in text_str for keyword in incident_keywords)):
-                        print(f"   🔍 Fallback found potential race info: \"{text_str}\"")
-                        race_info["class_distance_text"] = text_str
-
-                        # Try to extract distance at minimum
-                        distance_match = re.search(r'(\d+)米', text_str)
-                        if distance_match:
-                            race_info["distance"] = f"{distance_match.group(1)}米"
-                            print(f"   ✅ Extracted distance: {race_info['distance']}")
-
-                        # Try to extract any race class
-                        for pattern, class_type in [
-                            (r'第([一二三四五])班', lambda m: f"第{m.group(1)}班"),
-                            (r'([一二三])級賽', lambda m: f"{m.group(1)}級賽"),
-                            (r'表列賽', lambda m: "表列賽"),
-                            (r'新馬', lambda m: "新馬賽"),
-                            (r'讓賽', lambda m: "讓賽"),
-                            (r'([二三四五])歲', lambda m: f"{m.group(1)}歲")
-                        ]:
-                            if isinstance(pattern, str) and pattern in text_str:
-                                race_info["race_class"] = class_type(None)
-                                print(f"   ✅ Extracted race class: {race_info['race_class']}")
-                                break
-                            elif hasattr(pattern, 'search'):
-                                match = re.search(pattern, text_str)
-                                if match:
-                                    race_info["race_class"] = class_type(match)
-                                    print(f"   ✅ Extracted race class: {race_info['race_class']}")
-                                    break
-                        break
+            for text_str in distance_texts:
+                # Look for any text containing distance (米) that might be race info,
+                # with a race-related keyword and no incident report wording
+                if (len(text_str) > 3 and
+                        _FALLBACK_KEYWORD_RE.search(text_str) and
+                        not _INCIDENT_RE.search(text_str)):
+                    print(f"   🔍 Fallback found potential race info: \"{text_str}\"")
+                    race_info["class_distance_text"] = text_str
+
+                    # Try to extract distance at minimum
+                    distance_match = _DIST_RE.search(text_str)
+                    if distance_match:
+                        race_info["distance"] = f"{distance_match.group(1)}米"
+                        print(f"   ✅ Extracted distance: {race_info['distance']}")
+
+                    # Try to extract any race class
+                    race_class = _match_race_class(text_str)
+                    if race_class:
+                        race_info["race_class"] = race_class
+                        print(f"   ✅ Extracted race class: {race_info['race_class']}")
+                    break
 
         # Create combined full text and race name
         if race_number_text and race_class_distance_text:
@@ -362,7 +666,7 @@ def extract_race_info_from_results(soup):
                 race_info["race_name"] = f"{race_info['race_class']} {race_info['distance']}"
         
         # Look for track condition
-        condition_text = soup.find(text=re.compile(r'場地狀況'))
+        condition_text = label_texts.get('場地狀況')
         if condition_text:
             parent = condition_text.parent
             if parent:
@@ -371,7 +675,7 @@ def extract_race_info_from_results(soup):
                     race_info["track_condition"] = next_sibling.get_text(strip=True)
         
         # Look for track type
-        track_text = soup.find(text=re.compile(r'賽道'))
+        track_text = label_texts.get('賽道')
         if track_text:
             parent = track_text.parent
             if parent:
@@ -380,7 +684,7 @@ def extract_race_info_from_results(soup):
                     race_info["track_type"] = next_sibling.get_text(strip=True)
         
         # Look for prize money
-        prize_text = soup.find(text=re.compile(r'HK\$'))
+        prize_text = label_texts.get('HK$')
         if prize_text:
             race_info["prize_money"] = prize_text.strip()
         
@@ -390,13 +694,17 @@ def extract_race_info_from_results(soup):
         print(f"Error extracting race info: {str(e)}")
         return {}
 
-def extract_sectional_times(soup):
+def extract_sectional_times(soup, tables=None, results_rows=None, label_texts=None):
     """Extract sectional times from the results page with enhanced sectional detection."""
     sectional_times = {}
 
     try:
+        # Find both labels in one walk of the document, unless the caller already did
+        if label_texts is None:
+            label_texts = _first_texts_containing(_iter_text_nodes(soup), ('時間', '分段時間'))
+
         # Look for time information
-        time_text = soup.find(text=re.compile(r'時間'))
+        time_text = label_texts.get('時間')
         if time_text:
             parent = time_text.parent
             if parent:
@@ -405,12 +713,12 @@ def extract_sectional_times(soup):
                 if next_element:
                     times_text = next_element.get_text(strip=True)
                     # Extract individual times using regex
-                    time_matches = re.findall(r'\(([0-9:.]+)\)', times_text)
+                    time_matches = _RACE_TIMES_RE.findall(times_text)
                     if time_matches:
                         sectional_times["times"] = time_matches
 
         # Look for sectional time breakdown
-        sectional_text = soup.find(text=re.compile(r'分段時間'))
+        sectional_text = label_texts.get('分段時間')
         if sectional_text:
             parent = sectional_text.parent
             if parent:
@@ -418,17 +726,17 @@ def extract_sectional_times(soup):
                 if next_element:
                     sectional_breakdown = next_element.get_text(strip=True)
                     # Extract sectional times
-                    sectional_matches = re.findall(r'([0-9.]+)', sectional_breakdown)
+                    sectional_matches = _SECTIONAL_RE.findall(sectional_breakdown)
                     if sectional_matches:
                         sectional_times["sectional_breakdown"] = sectional_matches
 
         # Enhanced: Try to extract additional sectional times from running positions
-        enhanced_sectionals = extract_enhanced_sectional_times(soup)
+        enhanced_sectionals = extract_enhanced_sectional_times(soup, tables, results_rows)
         if enhanced_sectionals:
             sectional_times.update(enhanced_sectionals)
 
         # Apply sectional time fixing logic if needed
-        sectional_times = fix_sectional_times_during_extraction(sectional_times, soup)
+        sectional_times = fix_sectional_times_during_extraction(sectional_times, soup, tables, results_rows)
 
         return sectional_times
 
@@ -436,28 +744,13 @@ def extract_sectional_times(soup):
         print(f"Error extracting sectional times: {str(e)}")
         return {}
 
-def extract_enhanced_sectional_times(soup):
+def extract_enhanced_sectional_times(soup, tables=None, results_rows=None):
     """Extract enhanced sectional times by analyzing running positions and timing data."""
     enhanced_sectionals = {}
 
     try:
-        # Find the results table to analyze running positions
-        tables = soup.find_all('table')
-        running_positions = []
-
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all('td')
-                if len(cells) >= 10:
-                    # Check if this looks like a results row
-                    first_cell = cells[0].get_text(strip=True)
-                    if first_cell.isdigit() and int(first_cell) <= 20:
-                        # Extract running position
-                        if len(cells) > 9:
-                            running_pos = cells[9].get_text(strip=True)
-                            if running_pos and running_pos != '-':
-                                running_positions.append(running_pos)
+        # Analyze running positions from the results rows
+        running_positions = extract_running_positions_for_sectional_analysis(soup, tables, results_rows)
 
         if running_positions:
             # Analyze running positions to determine sectional structure
@@ -479,6 +772,11 @@ def extract_enhanced_sectional_times(soup):
         print(f"Error in enhanced sectional extraction: {str(e)}")
         return {}
 
+def _most_common(values):
+    """Return the most frequent value in a short list (ties go to the first seen)."""
+    # The lists are at most ~20 sectional counts, so a count scan beats building a Counter
+    return max(values, key=values.count)
+
 def analyze_sectional_count_from_positions(running_positions):
     """Analyze running positions to determine how many sectionals there are."""
     try:
@@ -508,9 +806,7 @@ def analyze_sectional_count_from_positions(running_positions):
 
         if sectional_counts:
             # Return the most common sectional count
-            from collections import Counter
-            most_common = Counter(sectional_counts).most_common(1)
-            return most_common[0][0] if most_common else 1
+            return _most_common(sectional_counts)
 
         return 1
 
@@ -538,7 +834,7 @@ def extract_sectional_splits_from_timing(soup, sectional_count):
         print(f"Error extracting sectional splits: {str(e)}")
         return None
 
-def fix_sectional_times_during_extraction(sectional_times, soup):
+def fix_sectional_times_during_extraction(sectional_times, soup, tables=None, results_rows=None):
     """Fix sectional times during extraction using enhanced logic from fix_sectional_extraction.py."""
     try:
         # Get current sectional breakdown
@@ -549,21 +845,20 @@ def fix_sectional_times_during_extraction(sectional_times, soup):
             return sectional_times
 
         # Get running positions from the soup to analyze sectional count
-        running_positions = extract_running_positions_for_sectional_analysis(soup)
+        running_positions = extract_running_positions_for_sectional_analysis(soup, tables, results_rows)
 
         if running_positions:
             # Parse running positions to determine sectional count
             sectional_positions = parse_running_positions_for_sectionals(running_positions)
             if sectional_positions:
                 sectional_counts = [len(pos) for pos in sectional_positions]
-                from collections import Counter
-                most_common_count = Counter(sectional_counts).most_common(1)[0][0]
+                most_common_count = _most_common(sectional_counts)
 
                 if most_common_count > 1 and len(current_sectionals) == 1:
                     # We need to fix this!
                     base_sectional = current_sectionals[0]
                     estimated_sectionals = estimate_sectional_times_from_positions_enhanced(
-                        running_positions, base_sectional
+                        running_positions, base_sectional, most_common_count
                     )
 
                     print(f"   🔧 Sectional fix applied: {current_sectionals} → {estimated_sectionals}")
@@ -575,23 +870,19 @@ def fix_sectional_times_during_extraction(sectional_times, soup):
         print(f"Error fixing sectional times during extraction: {str(e)}")
         return sectional_times
 
-def extract_running_positions_for_sectional_analysis(soup):
+def extract_running_positions_for_sectional_analysis(soup, tables=None, results_rows=None):
     """Extract running positions specifically for sectional analysis."""
     running_positions = []
 
     try:
-        tables = soup.find_all('table')
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all('td')
-                if len(cells) >= 10:
-                    first_cell = cells[0].get_text(strip=True)
-                    if first_cell.isdigit() and int(first_cell) <= 20:
-                        if len(cells) > 9:
-                            running_pos = cells[9].get_text(strip=True)
-                            if running_pos and running_pos != '-':
-                                running_positions.append(running_pos)
+        if results_rows is None:
+            if tables is None:
+                tables = soup.find_all('table')
+            results_rows = _extract_results_rows(tables)
+        for cells in results_rows:
+            running_pos = cells[9]
+            if running_pos and running_pos != '-':
+                running_positions.append(running_pos)
 
         return running_positions
 
@@ -612,157 +903,118 @@ def parse_running_positions_for_sectionals(running_positions):
             # Method 2: Concatenated positions (current issue)
             elif pos.isdigit() and len(pos) > 1:
                 # Parse digit-by-digit
-                positions = [pos[i] for i in range(len(pos))]
-                sectional_positions.append(positions)
+                sectional_positions.append(list(pos))
 
     return sectional_positions
 
-def estimate_sectional_times_from_positions_enhanced(running_positions, base_sectional_time):
-    """Estimate sectional times based on running positions and base time."""
+# Share of the base sectional time given to each sectional, by sectional count:
+# 2 split evenly, 3 is the typical 1200m pattern, 4 is typical for longer races.
+# Larger counts are filled in on first use by _sectional_proportions.
+_SECTIONAL_PROPORTIONS = {
+    2: (0.5, 0.5),
+    3: (0.4, 0.35, 0.25),
+    4: (0.3, 0.25, 0.25, 0.2),
+}
+
+def _sectional_proportions(sectional_count):
+    """Return the per-sectional share of the base time for sectional_count (>= 2) sectionals."""
+    proportions = _SECTIONAL_PROPORTIONS.get(sectional_count)
+    if proportions is None:
+        # 5+ sectionals: early sectionals are typically slower, final sectionals faster
+        proportions = ((1.2 / sectional_count,) +
+                       (1.0 / sectional_count,) * (sectional_count - 2) +
+                       (0.8 / sectional_count,))
+        _SECTIONAL_PROPORTIONS[sectional_count] = proportions
+    return proportions
+
+def estimate_sectional_times_from_positions_enhanced(running_positions, base_sectional_time, sectional_count=None):
+    """Estimate sectional times based on running positions and base time.
+
+    sectional_count: most common sectional count, if the caller has already
+    derived it from running_positions (skips parsing them again)
+    """
     try:
-        sectional_positions = parse_running_positions_for_sectionals(running_positions)
+        if sectional_count is not None:
+            most_common_count = sectional_count
+        else:
+            sectional_positions = parse_running_positions_for_sectionals(running_positions)
 
-        if not sectional_positions:
-            return [base_sectional_time]
+            if not sectional_positions:
+                return [base_sectional_time]
 
-        # Determine most common sectional count
-        sectional_counts = [len(pos) for pos in sectional_positions]
-        from collections import Counter
-        most_common_count = Counter(sectional_counts).most_common(1)[0][0]
+            # Determine most common sectional count
+            sectional_counts = [len(pos) for pos in sectional_positions]
+            most_common_count = _most_common(sectional_counts)
 
         if most_common_count <= 1:
             return [base_sectional_time]
 
         # For now, estimate sectional times based on typical patterns
         base_time = float(base_sectional_time)
-
-        if most_common_count == 2:
-            # 2 sectionals - split roughly evenly
-            return [str(round(base_time * 0.5, 2)), str(round(base_time * 0.5, 2))]
-
-        elif most_common_count == 3:
-            # 3 sectionals - typical pattern for 1200m races
-            return [
-                str(round(base_time * 0.4, 2)),  # First sectional (faster)
-                str(round(base_time * 0.35, 2)), # Second sectional
-                str(round(base_time * 0.25, 2))  # Final sectional (fastest)
-            ]
-
-        elif most_common_count == 4:
-            # 4 sectionals - typical for longer races
-            return [
-                str(round(base_time * 0.3, 2)),   # First sectional
-                str(round(base_time * 0.25, 2)),  # Second sectional
-                str(round(base_time * 0.25, 2)),  # Third sectional
-                str(round(base_time * 0.2, 2))   # Final sectional
-            ]
-
-        else:
-            # 5+ sectionals - distribute evenly
-            sectional_count = most_common_count
-            sectional_times = []
-
-            # Create a distribution pattern for any number of sectionals
-            # Early sectionals are typically slower, final sectionals faster
-            for i in range(sectional_count):
-                if i == 0:
-                    # First sectional (slowest)
-                    proportion = 1.2 / sectional_count
-                elif i == sectional_count - 1:
-                    # Final sectional (fastest)
-                    proportion = 0.8 / sectional_count
-                else:
-                    # Middle sectionals
-                    proportion = 1.0 / sectional_count
-
-                sectional_time = round(base_time * proportion, 2)
-                sectional_times.append(str(sectional_time))
-
-            return sectional_times
+        return [str(round(base_time * proportion, 2)) for proportion in _sectional_proportions(most_common_count)]
 
     except Exception as e:
         print(f"Error estimating sectional times: {e}")
         return [base_sectional_time]
 
-def extract_finishing_positions(soup):
+def _extract_results_rows(tables):
+    """Return the cell texts of every results row (10+ cells, position 1-20) in tables."""
+    results_rows = []
+    for table in tables:
+        for row in _table_rows(table):
+            cells = row.find_all('td', recursive=False)
+            if len(cells) >= 10:
+                first_cell = cells[0].get_text(strip=True)
+                if first_cell.isdigit() and int(first_cell) <= 20:
+                    results_rows.append([first_cell] + [cell.get_text(strip=True) for cell in cells[1:]])
+    return results_rows
+
+def extract_finishing_positions(soup, tables=None, results_rows=None):
     """Extract finishing positions and horse details from results table."""
     results = []
 
     try:
-        # Find the results table
-        tables = soup.find_all('table')
+        # Find the results rows
+        if results_rows is None:
+            if tables is None:
+                tables = soup.find_all('table')
+            results_rows = _extract_results_rows(tables)
+
+        for cells in results_rows:
+            # Extract horse name (usually contains both Chinese and code)
+            horse_name_text = cells[2]
+            horse_name = horse_name_text
+            horse_code = None
+
+            # Try to separate horse name and code
+            if '(' in horse_name_text and ')' in horse_name_text:
+                name_match = _HORSE_NAME_RE.match(horse_name_text)
+                if name_match:
+                    horse_name = name_match.group(1).strip()
+                    horse_code = name_match.group(2).strip()
+
+            # Extract horse details
+            horse_result = {
+                "position": int(cells[0]),
+                "horse_number": cells[1],
+                "horse_name": horse_name,
+                "jockey": cells[3],
+                "trainer": cells[4],
+                "actual_weight": cells[5],
+                "declared_weight": cells[6],
+                "draw": cells[7],
+                "margin": cells[8],
+                "running_position": cells[9],
+                "finish_time": cells[10] if len(cells) > 10 else "",
+                "win_odds": cells[11] if len(cells) > 11 else ""
+            }
+            if horse_code is not None:
+                horse_result["horse_code"] = horse_code
 
-        for table in tables:
-            rows = table.find_all('tr')
-
-            for row in rows:
-                cells = row.find_all('td')
-
-                # Check if this looks like a results row (should have many columns)
-                if len(cells) >= 10:
-                    # Try to extract position from first cell
-                    first_cell = cells[0].get_text(strip=True)
-
-                    # Check if first cell contains a position number
-                    if first_cell.isdigit() and int(first_cell) <= 20:
-                        position = int(first_cell)
-
-                        # Extract horse details
-                        horse_result = {
-                            "position": position,
-                            "horse_number": cells[1].get_text(strip=True) if len(cells) > 1 else "",
-                            "horse_name": "",
-                            "jockey": "",
-                            "trainer": "",
-                            "actual_weight": "",
-                            "declared_weight": "",
-                            "draw": "",
-                            "margin": "",
-                            "running_position": "",
-                            "finish_time": "",
-                            "win_odds": ""
-                        }
-
-                        # Extract horse name (usually contains both Chinese and code)
-                        if len(cells) > 2:
-                            horse_name_cell = cells[2]
-                            horse_name_text = horse_name_cell.get_text(strip=True)
-
-                            # Try to separate horse name and code
-                            if '(' in horse_name_text and ')' in horse_name_text:
-                                name_match = re.match(r'(.+?)\s*\(([^)]+)\)', horse_name_text)
-                                if name_match:
-                                    horse_result["horse_name"] = name_match.group(1).strip()
-                                    horse_result["horse_code"] = name_match.group(2).strip()
-                                else:
-                                    horse_result["horse_name"] = horse_name_text
-                            else:
-                                horse_result["horse_name"] = horse_name_text
-
-                        # Extract other details based on typical column positions
-                        if len(cells) > 3:
-                            horse_result["jockey"] = cells[3].get_text(strip=True)
-                        if len(cells) > 4:
-                            horse_result["trainer"] = cells[4].get_text(strip=True)
-                        if len(cells) > 5:
-                            horse_result["actual_weight"] = cells[5].get_text(strip=True)
-                        if len(cells) > 6:
-                            horse_result["declared_weight"] = cells[6].get_text(strip=True)
-                        if len(cells) > 7:
-                            horse_result["draw"] = cells[7].get_text(strip=True)
-                        if len(cells) > 8:
-                            horse_result["margin"] = cells[8].get_text(strip=True)
-                        if len(cells) > 9:
-                            horse_result["running_position"] = cells[9].get_text(strip=True)
-                        if len(cells) > 10:
-                            horse_result["finish_time"] = cells[10].get_text(strip=True)
-                        if len(cells) > 11:
-                            horse_result["win_odds"] = cells[11].get_text(strip=True)
-
-                        results.append(horse_result)
+            results.append(horse_result)
 
         # Sort results by position
-        results.sort(key=lambda x: x["position"])
+        results.sort(key=itemgetter("position"))
 
         return results
 
@@ -770,215 +1022,108 @@ def extract_finishing_positions(soup):
         print(f"Error extracting finishing positions: {str(e)}")
         return []
 
-def extract_payouts(soup):
+def _add_payout(payouts, seen_payouts, bet_type, combination, payout_amount, dedupe):
+    """Append a combination/payout pair to payouts[bet_type], skipping exact repeats if dedupe.
+
+    seen_payouts maps each bet type to the (combination, payout) pairs already
+    in payouts, so the repeat check doesn't rescan the list.
+    """
+    key = (combination, payout_amount)
+    seen = seen_payouts.setdefault(bet_type, set())
+    if dedupe and key in seen:
+        return
+    seen.add(key)
+    payouts[bet_type].append({
+        "combination": combination,
+        "payout": payout_amount
+    })
+
+def _parse_payout_table(table, payouts, seen_payouts, dedupe):
+    """Add the payouts listed in one table to payouts, keyed by bet type.
+
+    Args:
+        table: <table> element holding pool / combination / payout rows
+        payouts: Dict of bet type -> list of payouts, updated in place
+        seen_payouts: Dict of bet type -> set of (combination, payout) pairs in payouts
+        dedupe: Skip combinations already recorded for the bet type (2-cell
+            continuation rows are always checked)
+    """
+    current_bet_type = None
+
+    for row in _table_rows(table):
+        cells = row.find_all('td', recursive=False)
+
+        if len(cells) >= 3:
+            first_cell = cells[0].get_text(strip=True)
+            second_cell = cells[1].get_text(strip=True)
+            third_cell = cells[2].get_text(strip=True)
+
+            # Skip header rows
+            if first_cell in _PAYOUT_HEADER_CELLS or third_cell in _PAYOUT_HEADER_AMOUNTS:
+                continue
+
+            # A standard pool or an exotic pool (孖寶, 孖T patterns) starts a new bet type
+            if first_cell and _BET_TYPE_RE.search(first_cell):
+                # Interned so that every table naming this pool keys payouts and
+                # seen_payouts with the same string object
+                current_bet_type = sys.intern(first_cell)
+                if current_bet_type not in payouts:
+                    payouts[current_bet_type] = []
+
+                if second_cell and third_cell:
+                    _add_payout(payouts, seen_payouts, current_bet_type, second_cell, third_cell, dedupe)
+
+            # Continuation row for the same bet type (especially for 位置 and 位置Q)
+            elif current_bet_type and not first_cell and second_cell and third_cell:
+                _add_payout(payouts, seen_payouts, current_bet_type, second_cell, third_cell, dedupe)
+
+        # Handle rows with 2 cells (continuation rows for 位置 and 位置Q)
+        elif len(cells) == 2 and current_bet_type:
+            first_cell = cells[0].get_text(strip=True)
+            second_cell = cells[1].get_text(strip=True)
+
+            # Check if this looks like a payout continuation row
+            # (first cell has combination, second cell has money amount)
+            if (first_cell and second_cell and
+                _DIGIT_RE.search(first_cell) and
+                _DIGIT_RE.search(second_cell)):
+                _add_payout(payouts, seen_payouts, current_bet_type, first_cell, second_cell, True)
+
+def extract_payouts(soup, tables=None, label_texts=None, table_texts=None):
     """Extract betting payouts from the results page."""
     payouts = {}
+    seen_payouts = {}
 
     try:
+        # Tables already parsed, so the pool-name search below doesn't repeat them
+        seen = set()
+
         # Look for the payouts section (派彩)
-        payout_text = soup.find(text=re.compile(r'派彩'))
+        if label_texts is None:
+            label_texts = _first_texts_containing(_iter_text_nodes(soup), ('派彩',))
+        payout_text = label_texts.get('派彩')
         if payout_text:
             # Find the table containing payouts
             parent = payout_text.parent
             while parent and parent.name != 'table':
                 parent = parent.parent
-                if not parent:
-                    break
 
             if parent and parent.name == 'table':
-                rows = parent.find_all('tr')
-                current_bet_type = None
-
-                for row in rows:
-                    cells = row.find_all('td')
-
-                    if len(cells) >= 3:
-                        first_cell = cells[0].get_text(strip=True)
-                        second_cell = cells[1].get_text(strip=True)
-                        third_cell = cells[2].get_text(strip=True)
-
-                        # Skip header rows
-                        if first_cell in ['彩池', '勝出組合'] or third_cell in ['派彩 (HK$)', '派彩']:
-                            continue
-
-                        # Check if this is a new bet type row using dynamic detection
-                        is_new_bet_type = False
-                        if first_cell and len(first_cell.strip()) > 0:
-                            # Known standard pool types
-                            standard_pools = ['獨贏', '位置', '連贏', '位置Q', '二重彩', '三重彩', '單T', '四連環', '四重彩']
-
-                            # Dynamic detection for exotic pools (孖寶, 孖T patterns)
-                            exotic_patterns = ['孖寶', '孖T', '口孖']
-
-                            # Check if it's a standard pool or matches exotic patterns
-                            if (first_cell in standard_pools or
-                                any(pattern in first_cell for pattern in exotic_patterns)):
-                                is_new_bet_type = True
-
-                        if is_new_bet_type:
-                            current_bet_type = first_cell
-                            combination = second_cell
-                            payout_amount = third_cell
-
-                            if current_bet_type not in payouts:
-                                payouts[current_bet_type] = []
-
-                            if combination and payout_amount:
-                                payouts[current_bet_type].append({
-                                    "combination": combination,
-                                    "payout": payout_amount
-                                })
-
-                        # Check if this is a continuation row for the same bet type (especially for 位置 and 位置Q)
-                        elif current_bet_type and not first_cell and second_cell and third_cell:
-                            # This is likely a continuation row for the current bet type
-                            combination = second_cell
-                            payout_amount = third_cell
-
-                            if combination and payout_amount:
-                                payouts[current_bet_type].append({
-                                    "combination": combination,
-                                    "payout": payout_amount
-                                })
-
-                        # Check if first cell is empty but we have combination and payout (continuation row)
-                        elif current_bet_type and first_cell == "" and second_cell and third_cell:
-                            combination = second_cell
-                            payout_amount = third_cell
-
-                            if combination and payout_amount:
-                                payouts[current_bet_type].append({
-                                    "combination": combination,
-                                    "payout": payout_amount
-                                })
-
-                    # Handle rows with 2 cells (continuation rows for 位置 and 位置Q)
-                    elif len(cells) == 2 and current_bet_type:
-                        first_cell = cells[0].get_text(strip=True)
-                        second_cell = cells[1].get_text(strip=True)
-
-                        # Check if this looks like a payout continuation row
-                        # (first cell has combination, second cell has money amount)
-                        if (first_cell and second_cell and
-                            any(char.isdigit() for char in first_cell) and
-                            any(char.isdigit() for char in second_cell)):
-
-                            combination = first_cell
-                            payout_amount = second_cell
-
-                            # Check if this combination already exists
-                            existing = False
-                            for existing_payout in payouts.get(current_bet_type, []):
-                                if existing_payout['combination'] == combination and existing_payout['payout'] == payout_amount:
-                                    existing = True
-                                    break
-
-                            if not existing:
-                                payouts[current_bet_type].append({
-                                    "combination": combination,
-                                    "payout": payout_amount
-                                })
+                _parse_payout_table(parent, payouts, seen_payouts, dedupe=False)
+                seen.add(id(parent))
 
         # Also look for any other payout tables that might not have the exact "派彩" text
         # Search for tables that contain betting pool information
-        all_tables = soup.find_all('table')
-        for table in all_tables:
-            table_text = table.get_text()
+        if tables is None:
+            tables = soup.find_all('table')
+        if table_texts is None:
+            table_texts = [table.get_text() for table in tables]
+        for table, table_text in zip(tables, table_texts):
+            if id(table) in seen:
+                continue
             # Look for common betting pool names
-            if any(keyword in table_text for keyword in ['獨贏', '位置', '連贏', '位置Q', '二重彩', '三重彩', '單T', '四連環', '四重彩']):
-                rows = table.find_all('tr')
-                current_bet_type = None
-
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) >= 3:
-                        first_cell = cells[0].get_text(strip=True)
-                        second_cell = cells[1].get_text(strip=True)
-                        third_cell = cells[2].get_text(strip=True)
-
-                        # Skip header rows
-                        if first_cell in ['彩池', '勝出組合'] or third_cell in ['派彩 (HK$)', '派彩']:
-                            continue
-
-                        # Check if this is a new bet type row using dynamic detection
-                        is_new_bet_type = False
-                        if first_cell and len(first_cell.strip()) > 0:
-                            # Known standard pool types
-                            standard_pools = ['獨贏', '位置', '連贏', '位置Q', '二重彩', '三重彩', '單T', '四連環', '四重彩']
-
-                            # Dynamic detection for exotic pools (孖寶, 孖T patterns)
-                            exotic_patterns = ['孖寶', '孖T', '口孖']
-
-                            # Check if it's a standard pool or matches exotic patterns
-                            if (first_cell in standard_pools or
-                                any(pattern in first_cell for pattern in exotic_patterns)):
-                                is_new_bet_type = True
-
-                        if is_new_bet_type:
-                            current_bet_type = first_cell
-                            combination = second_cell
-                            payout_amount = third_cell
-
-                            if current_bet_type not in payouts:
-                                payouts[current_bet_type] = []
-
-                            # Check if this combination already exists
-                            existing = False
-                            for existing_payout in payouts[current_bet_type]:
-                                if existing_payout['combination'] == combination and existing_payout['payout'] == payout_amount:
-                                    existing = True
-                                    break
-
-                            if not existing and combination and payout_amount:
-                                payouts[current_bet_type].append({
-                                    "combination": combination,
-                                    "payout": payout_amount
-                                })
-
-                        # Check if this is a continuation row for the same bet type
-                        elif current_bet_type and (not first_cell or first_cell == "") and second_cell and third_cell:
-                            combination = second_cell
-                            payout_amount = third_cell
-
-                            # Check if this combination already exists
-                            existing = False
-                            for existing_payout in payouts.get(current_bet_type, []):
-                                if existing_payout['combination'] == combination and existing_payout['payout'] == payout_amount:
-                                    existing = True
-                                    break
-
-                            if not existing and combination and payout_amount:
-                                payouts[current_bet_type].append({
-                                    "combination": combination,
-                                    "payout": payout_amount
-                                })
-
-                    # Handle rows with 2 cells (continuation rows for 位置 and 位置Q) - Second section
-                    elif len(cells) == 2 and current_bet_type:
-                        first_cell = cells[0].get_text(strip=True)
-                        second_cell = cells[1].get_text(strip=True)
-
-                        # Check if this looks like a payout continuation row
-                        # (first cell has combination, second cell has money amount)
-                        if (first_cell and second_cell and
-                            any(char.isdigit() for char in first_cell) and
-                            any(char.isdigit() for char in second_cell)):
-
-                            combination = first_cell
-                            payout_amount = second_cell
-
-                            # Check if this combination already exists
-                            existing = False
-                            for existing_payout in payouts.get(current_bet_type, []):
-                                if existing_payout['combination'] == combination and existing_payout['payout'] == payout_amount:
-                                    existing = True
-                                    break
-
-                            if not existing:
-                                payouts[current_bet_type].append({
-                                    "combination": combination,
-                                    "payout": payout_amount
-                                })
+            if _STANDARD_POOL_RE.search(table_text):
+                _parse_payout_table(table, payouts, seen_payouts, dedupe=True)
 
         return payouts
 
@@ -986,7 +1131,16 @@ def extract_payouts(soup):
         print(f"Error extracting payouts: {str(e)}")
         return {}
 
-def extract_race_incidents(soup):
+def _strip_horse_code(horse_name):
+    """Remove parenthesised codes from a horse name, e.g. "好馬 (A123)" -> "好馬"."""
+    # Usual case: a single trailing "(code)"; slice it off without the regex engine
+    head, _, code = horse_name.rpartition('(')
+    if (len(code) > 1 and code[-1] == ')' and ')' not in code[:-1] and
+            '(' not in head and ')' not in head):
+        return head.strip()
+    return _PAREN_STRIP_RE.sub('', horse_name).strip()
+
+def extract_race_incidents(soup, tables=None, table_texts=None):
     """Extract race incidents and reports."""
     incidents = []
 
@@ -994,45 +1148,46 @@ def extract_race_incidents(soup):
         print("🔍 Starting incidents extraction...")
 
         # Method: Look for tables that contain incident-related content
-        tables = soup.find_all('table')
+        if tables is None:
+            tables = soup.find_all('table')
+        if table_texts is None:
+            table_texts = [table.get_text() for table in tables]
         print(f"   Found {len(tables)} tables")
 
         incidents_table = None
-        incident_keywords = [
-            '競賽事件報告', '競賽事件', '賽後須抽取樣本檢驗',
-            '出閘笨拙', '內閃', '獸醫檢查', '煩躁不安', '出閘僅屬一般'
-        ]
 
         # Find the table that contains incidents using improved logic
-        for i, table in enumerate(tables):
-            table_text = table.get_text()
-
+        for i, (table, table_text) in enumerate(zip(tables, table_texts)):
             # Check if this table contains incident-related content
-            if any(keyword in table_text for keyword in incident_keywords):
+            if _INCIDENT_REPORT_RE.search(table_text):
                 print(f"   🔍 Table {i+1} contains incident keywords")
 
-                # Check if it has incident data rows
-                rows = table.find_all('tr')
+                # Check if it has incident data rows; keep each row's cell texts so
+                # the chosen table doesn't have to be read again below
+                rows = _table_rows(table)
+                row_texts = []
                 incident_rows_found = 0
 
                 for row in rows:
-                    cells = row.find_all(['td', 'th'])
+                    cells = row.find_all(['td', 'th'], recursive=False)
                     if len(cells) >= 4:
                         cell_texts = [cell.get_text(strip=True) for cell in cells]
+                        row_texts.append(cell_texts)
 
-                        # Check if this looks like an incident row
-                        if (len(cell_texts) >= 4 and
-                            (cell_texts[0].isdigit() or cell_texts[0] in ['WV', 'DNF']) and
+                        # Check if this looks like an incident row: substantial incident
+                        # text, a horse number and a finishing position (or WV / DNF)
+                        if (len(cell_texts[3]) > 10 and
                             cell_texts[1].isdigit() and
-                            len(cell_texts[3]) > 10):  # Substantial incident text
+                            (cell_texts[0].isdigit() or cell_texts[0] in _SPECIAL_POSITIONS)):
 
                             # Check if it contains incident keywords
-                            incident_text = cell_texts[3]
-                            if any(keyword in incident_text for keyword in incident_keywords):
+                            if _INCIDENT_REPORT_RE.search(cell_texts[3]):
                                 incident_rows_found += 1
 
                 if incident_rows_found > 0:
                     incidents_table = table
+                    incidents_row_count = len(rows)
+                    incidents_row_texts = row_texts
                     print(f"   ✅ Found incidents table (Table {i+1}) with {incident_rows_found} incident rows")
                     break
 
@@ -1041,44 +1196,40 @@ def extract_race_incidents(soup):
             return []
 
         # Extract incidents from the found table
-        rows = incidents_table.find_all('tr')
-        print(f"   📊 Processing {len(rows)} rows from incidents table")
+        print(f"   📊 Processing {incidents_row_count} rows from incidents table")
 
-        for row_idx, row in enumerate(rows):
-            cells = row.find_all(['td', 'th'])
+        for cell_texts in incidents_row_texts:
+            position, horse_number, horse_name, incident_report = cell_texts[:4]
 
-            if len(cells) >= 4:
-                position = cells[0].get_text(strip=True)
-                horse_number = cells[1].get_text(strip=True)
-                horse_name = cells[2].get_text(strip=True)
-                incident_report = cells[3].get_text(strip=True)
+            # Skip header row
+            if position == '名次' or horse_number == '馬號':
+                continue
 
-                # Skip header row
-                if position == '名次' or horse_number == '馬號':
-                    continue
+            # Check if this is a valid incident row (including WV, DNF)
+            if (position.isdigit() and int(position) <= 20) or position in _SPECIAL_POSITIONS:
+                # Clean up horse name (remove horse code in parentheses)
+                clean_horse_name = horse_name
+                if '(' in horse_name and ')' in horse_name:
+                    clean_horse_name = _strip_horse_code(horse_name)
 
-                # Check if this is a valid incident row (including WV, DNF)
-                if (position.isdigit() and int(position) <= 20) or position in ['WV', 'DNF']:
-                    # Clean up horse name (remove horse code in parentheses)
-                    clean_horse_name = horse_name
-                    if '(' in horse_name and ')' in horse_name:
-                        clean_horse_name = re.sub(r'\s*\([^)]+\)', '', horse_name).strip()
-
-                    # Include ALL incidents, even "無特別報告"
-                    incident_entry = {
-                        "position": int(position) if position.isdigit() else position,
-                        "horse_number": horse_number,
-                        "horse_name": clean_horse_name,
-                        "horse_name_with_code": horse_name,
-                        "incident_report": incident_report,
-                        "incident_type": classify_incident_type(incident_report),
-                        "severity": assess_incident_severity(incident_report)
-                    }
+                # Scan the report for classification keywords once, for both type and severity
+                keywords = _report_keywords(incident_report)
 
-                    incidents.append(incident_entry)
+                # Include ALL incidents, even "無特別報告"
+                incident_entry = {
+                    "position": int(position) if position.isdigit() else position,
+                    "horse_number": horse_number,
+                    "horse_name": clean_horse_name,
+                    "horse_name_with_code": horse_name,
+                    "incident_report": incident_report,
+                    "incident_type": classify_incident_type(incident_report, keywords),
+                    "severity": assess_incident_severity(incident_report, keywords)
+                }
 
-                    if incident_report != "無特別報告":
-                        print(f"   🚨 Incident found: Position {position} - {clean_horse_name} - {incident_report[:50]}...")
+                incidents.append(incident_entry)
+
+                if incident_report != "無特別報告":
+                    print(f"   🚨 Incident found: Position {position} - {clean_horse_name} - {incident_report[:50]}...")
 
         print(f"   ✅ Extracted {len(incidents)} horse incidents")
         return incidents
@@ -1087,60 +1238,47 @@ def extract_race_incidents(soup):
         print(f"Error extracting race incidents: {str(e)}")
         return []
 
-def classify_incident_type(incident_report):
-    """Classify the type of incident based on the report text."""
+def _report_keywords(incident_report):
+    """Return the set of _REPORT_KEYWORDS found in an incident report, in one scan."""
+    if _REPORT_KEYWORD_AUTOMATON is not None:
+        return {keyword for _, keyword in _REPORT_KEYWORD_AUTOMATON.iter(incident_report)}
+    return set(_REPORT_KEYWORD_RE.findall(incident_report))
+
+def classify_incident_type(incident_report, keywords=None):
+    """Classify the type of incident based on the report text.
+
+    keywords: optional result of _report_keywords(incident_report), if already computed
+    """
     if not incident_report or incident_report == "無特別報告":
         return "no_incident"
 
-    # Define incident type patterns
-    if "抽取樣本檢驗" in incident_report:
-        return "post_race_testing"
-    elif "獸醫檢查" in incident_report:
-        return "veterinary_examination"
-    elif "試閘及格" in incident_report:
-        return "barrier_trial_required"
-    elif "流鼻血" in incident_report:
-        return "bleeding"
-    elif "小組譴責" in incident_report:
-        return "stewards_reprimand"
-    elif any(keyword in incident_report for keyword in ["出閘笨拙", "出閘緩慢"]):
-        return "starting_issues"
-    elif any(keyword in incident_report for keyword in ["向外斜跑", "向內斜跑", "斜跑"]):
-        return "running_wide_or_in"
-    elif any(keyword in incident_report for keyword in ["受擠迫", "被碰撞", "碰撞"]):
-        return "interference"
-    elif any(keyword in incident_report for keyword in ["收慢", "未能望空"]):
-        return "blocked_or_checked"
-    elif "煩躁不安" in incident_report:
-        return "fractious_in_gates"
-    elif "表現令人失望" in incident_report:
-        return "disappointing_performance"
-    else:
-        return "other_incident"
+    if keywords is None:
+        keywords = _report_keywords(incident_report)
+
+    # First incident type (in priority order) with a keyword in the report
+    for type_keywords, incident_type in _INCIDENT_TYPE_RULES:
+        if not keywords.isdisjoint(type_keywords):
+            return incident_type
+    return "other_incident"
+
+def assess_incident_severity(incident_report, keywords=None):
+    """Assess the severity of the incident.
 
-def assess_incident_severity(incident_report):
-    """Assess the severity of the incident."""
+    keywords: optional result of _report_keywords(incident_report), if already computed
+    """
     if not incident_report or incident_report == "無特別報告":
         return "none"
 
-    # High severity indicators
-    high_severity_keywords = ["流鼻血", "必須試閘及格", "小組譴責", "表現令人失望"]
-    if any(keyword in incident_report for keyword in high_severity_keywords):
-        return "high"
-
-    # Medium severity indicators
-    medium_severity_keywords = ["受擠迫", "被碰撞", "收慢", "出閘笨拙", "出閘緩慢"]
-    if any(keyword in incident_report for keyword in medium_severity_keywords):
-        return "medium"
+    if keywords is None:
+        keywords = _report_keywords(incident_report)
 
-    # Low severity indicators
-    low_severity_keywords = ["抽取樣本檢驗", "獸醫檢查", "向外斜跑", "向內斜跑"]
-    if any(keyword in incident_report for keyword in low_severity_keywords):
-        return "low"
+    for severity_keywords, severity in _SEVERITY_RULES:
+        if not keywords.isdisjoint(severity_keywords):
+            return severity
 
     return "medium"  # Default for unclassified incidents
 
-def extract_performance_data(soup, results, sectional_times=None):
+def extract_performance_data(soup, results, sectional_times=None, tables=None, label_texts=None, results_rows_by_table=None):
     """Extract performance-related data from the race results page."""
     performance_data = {
         "race_performance": {},
@@ -1151,16 +1289,19 @@ def extract_performance_data(soup, results, sectional_times=None):
 
     try:
         # 1. Extract race performance metrics (pass fixed sectional times)
-        performance_data["race_performance"] = extract_race_performance_metrics(soup, sectional_times)
+        # Both the metrics and the speed analysis search the page text for the race distance
+        page_text = soup.get_text()
+
+        performance_data["race_performance"] = extract_race_performance_metrics(soup, sectional_times, label_texts, page_text)
 
         # 2. Extract individual horse performance data
         performance_data["horse_performance"] = extract_horse_performance_data(soup, results)
 
         # 3. Extract speed and time analysis
-        performance_data["speed_analysis"] = extract_speed_analysis(soup)
+        performance_data["speed_analysis"] = extract_speed_analysis(soup, label_texts, page_text)
 
         # 4. Extract statistical data
-        performance_data["statistical_data"] = extract_statistical_data(soup)
+        performance_data["statistical_data"] = extract_statistical_data(soup, tables, results_rows_by_table)
 
         return performance_data
 
@@ -1173,13 +1314,20 @@ def extract_performance_data(soup, results, sectional_times=None):
             "statistical_data": {}
         }
 
-def extract_race_performance_metrics(soup, sectional_times=None):
-    """Extract overall race performance metrics."""
+def extract_race_performance_metrics(soup, sectional_times=None, label_texts=None, page_text=None):
+    """Extract overall race performance metrics.
+
+    page_text: optional soup.get_text(), if already computed
+    """
     metrics = {}
 
     try:
+        # Find every label this function reads in one walk of the document, unless the caller already did
+        if label_texts is None:
+            label_texts = _first_texts_containing(_iter_text_nodes(soup), ('時間', '分段時間', '場地狀況'))
+
         # Extract race time and speed metrics
-        time_text = soup.find(text=re.compile(r'時間'))
+        time_text = label_texts.get('時間')
         if time_text:
             parent = time_text.parent
             if parent:
@@ -1187,27 +1335,28 @@ def extract_race_performance_metrics(soup, sectional_times=None):
                 if next_element:
                     times_text = next_element.get_text(strip=True)
                     # Extract final time
-                    final_time_match = re.search(r'\(([0-9:]+\.[0-9]+)\)$', times_text)
+                    final_time_match = _FINAL_TIME_RE.search(times_text)
                     if final_time_match:
                         metrics["final_time"] = final_time_match.group(1)
 
                         # Calculate average speed if distance is available
-                        distance_match = re.search(r'(\d+)米', soup.get_text())
+                        if page_text is None:
+                            page_text = soup.get_text()
+                        distance_match = _DIST_RE.search(page_text)
                         if distance_match:
                             distance = int(distance_match.group(1))
-                            try:
-                                # Convert time to seconds
-                                time_parts = metrics["final_time"].split(':')
-                                if len(time_parts) == 2:
-                                    total_seconds = float(time_parts[0]) * 60 + float(time_parts[1])
+                            # Convert time to seconds; _FINAL_TIME_RE guarantees digits, colons
+                            # and a single decimal point, so only the minutes need checking
+                            time_parts = metrics["final_time"].split(':')
+                            if len(time_parts) == 2 and time_parts[0].isdigit():
+                                total_seconds = int(time_parts[0]) * 60 + float(time_parts[1])
+                                if total_seconds > 0:
                                     # Calculate speed in m/s
                                     speed_ms = distance / total_seconds
                                     # Convert to km/h
                                     speed_kmh = speed_ms * 3.6
                                     metrics["average_speed_kmh"] = round(speed_kmh, 2)
                                     metrics["average_speed_ms"] = round(speed_ms, 2)
-                            except:
-                                pass
 
         # Use fixed sectional times if provided, otherwise extract from soup
         if sectional_times and sectional_times.get('sectional_breakdown'):
@@ -1216,38 +1365,32 @@ def extract_race_performance_metrics(soup, sectional_times=None):
             metrics["sectional_times"] = fixed_sectionals
 
             # Calculate fastest and slowest sectionals from fixed data
-            try:
-                float_times = [float(t) for t in fixed_sectionals if t.replace('.', '').isdigit()]
-                if float_times:
-                    metrics["fastest_sectional"] = min(float_times)
-                    metrics["slowest_sectional"] = max(float_times)
-                    metrics["sectional_variance"] = round(max(float_times) - min(float_times), 2)
-            except:
-                pass
+            float_times = [float(t) for t in fixed_sectionals if _FLOAT_RE.match(t)]
+            if float_times:
+                metrics["fastest_sectional"] = min(float_times)
+                metrics["slowest_sectional"] = max(float_times)
+                metrics["sectional_variance"] = round(max(float_times) - min(float_times), 2)
         else:
             # Extract sectional time performance from soup (fallback)
-            sectional_text = soup.find(text=re.compile(r'分段時間'))
+            sectional_text = label_texts.get('分段時間')
             if sectional_text:
                 parent = sectional_text.parent
                 if parent:
                     next_element = parent.find_next()
                     if next_element:
                         sectional_breakdown = next_element.get_text(strip=True)
-                        sectional_times_list = re.findall(r'([0-9.]+)', sectional_breakdown)
+                        sectional_times_list = _SECTIONAL_RE.findall(sectional_breakdown)
                         if sectional_times_list:
                             metrics["sectional_times"] = sectional_times_list
                             # Calculate fastest and slowest sectionals
-                            try:
-                                float_times = [float(t) for t in sectional_times_list if t.replace('.', '').isdigit()]
-                                if float_times:
-                                    metrics["fastest_sectional"] = min(float_times)
-                                    metrics["slowest_sectional"] = max(float_times)
-                                    metrics["sectional_variance"] = round(max(float_times) - min(float_times), 2)
-                            except:
-                                pass
+                            float_times = [float(t) for t in sectional_times_list if _FLOAT_RE.match(t)]
+                            if float_times:
+                                metrics["fastest_sectional"] = min(float_times)
+                                metrics["slowest_sectional"] = max(float_times)
+                                metrics["sectional_variance"] = round(max(float_times) - min(float_times), 2)
 
         # Extract track condition impact
-        condition_text = soup.find(text=re.compile(r'場地狀況'))
+        condition_text = label_texts.get('場地狀況')
         if condition_text:
             parent = condition_text.parent
             if parent:
@@ -1279,69 +1422,52 @@ def extract_horse_performance_data(soup, results):
 
     try:
         for horse in results:
+            metrics = {}
             performance = {
                 "horse_number": horse.get("horse_number", ""),
                 "horse_name": horse.get("horse_name", ""),
                 "position": horse.get("position", 0),
-                "performance_metrics": {}
+                "performance_metrics": metrics
             }
 
-            # Calculate performance metrics
+            # Calculate performance metrics; a non-numeric position (WV, DNF) or a
+            # malformed odds value ends this horse's metrics early
             try:
                 # Win odds performance
                 win_odds = horse.get("win_odds", "")
-                if win_odds and win_odds.replace('.', '').isdigit():
+                if win_odds and _FLOAT_RE.match(win_odds):
                     odds_float = float(win_odds)
-                    performance["performance_metrics"]["win_odds"] = odds_float
+                    metrics["win_odds"] = odds_float
 
                     # Calculate odds performance rating
-                    if odds_float <= 3.0:
-                        performance["performance_metrics"]["odds_rating"] = "strong_favorite"
-                    elif odds_float <= 6.0:
-                        performance["performance_metrics"]["odds_rating"] = "favorite"
-                    elif odds_float <= 15.0:
-                        performance["performance_metrics"]["odds_rating"] = "competitive"
-                    else:
-                        performance["performance_metrics"]["odds_rating"] = "outsider"
+                    metrics["odds_rating"] = _ODDS_RATINGS[bisect_left(_ODDS_RATING_BOUNDS, odds_float)]
 
                 # Position performance
                 position = horse.get("position", 0)
                 if position:
-                    if position == 1:
-                        performance["performance_metrics"]["result_rating"] = "winner"
-                    elif position <= 3:
-                        performance["performance_metrics"]["result_rating"] = "placed"
-                    elif position <= 6:
-                        performance["performance_metrics"]["result_rating"] = "competitive"
-                    else:
-                        performance["performance_metrics"]["result_rating"] = "unplaced"
+                    metrics["result_rating"] = _RESULT_RATINGS[bisect_left(_RESULT_RATING_BOUNDS, position)]
 
                 # Weight performance
                 actual_weight = horse.get("actual_weight", "")
                 if actual_weight and actual_weight.isdigit():
                     weight = int(actual_weight)
-                    performance["performance_metrics"]["weight_carried"] = weight
+                    metrics["weight_carried"] = weight
 
                     # Weight performance rating
-                    if weight >= 130:
-                        performance["performance_metrics"]["weight_rating"] = "heavy"
-                    elif weight >= 120:
-                        performance["performance_metrics"]["weight_rating"] = "moderate"
-                    else:
-                        performance["performance_metrics"]["weight_rating"] = "light"
+                    metrics["weight_rating"] = _WEIGHT_RATINGS[bisect_right(_WEIGHT_RATING_BOUNDS, weight)]
 
                 # Margin analysis
                 margin = horse.get("margin", "")
                 if margin and margin != "-":
-                    performance["performance_metrics"]["margin"] = margin
+                    metrics["margin"] = margin
 
                     # Parse margin for numerical analysis
                     if "頭" in margin:
-                        length_match = re.search(r'(\d+(?:-\d+/\d+)?)', margin)
+                        length_match = _MARGIN_LENGTHS_RE.search(margin)
                         if length_match:
-                            performance["performance_metrics"]["margin_lengths"] = length_match.group(1)
+                            metrics["margin_lengths"] = length_match.group(1)
 
-            except Exception as e:
+            except (ValueError, TypeError, AttributeError) as e:
                 print(f"Error calculating performance metrics for horse {horse.get('horse_name', '')}: {str(e)}")
 
             horse_performance.append(performance)
@@ -1352,28 +1478,44 @@ def extract_horse_performance_data(soup, results):
         print(f"Error extracting horse performance data: {str(e)}")
         return []
 
-def extract_speed_analysis(soup):
-    """Extract speed and time analysis data."""
+def _closest_standard_distance(distance):
+    """Index into _STANDARD_DISTANCES of the distance closest to distance (the shorter one on a tie)"""
+    i = bisect_left(_STANDARD_DISTANCES, distance)
+    if i == 0:
+        return 0
+    if i == len(_STANDARD_DISTANCES):
+        return i - 1
+    return i if _STANDARD_DISTANCES[i] - distance < distance - _STANDARD_DISTANCES[i - 1] else i - 1
+
+def extract_speed_analysis(soup, label_texts=None, page_text=None):
+    """Extract speed and time analysis data.
+
+    page_text: optional soup.get_text(), if already computed
+    """
     speed_analysis = {}
 
     try:
+        # Find both labels in one walk of the document, unless the caller already did
+        if label_texts is None:
+            label_texts = _first_texts_containing(_iter_text_nodes(soup), ('分段時間', '時間'))
+
         # Extract sectional speed analysis
-        sectional_text = soup.find(text=re.compile(r'分段時間'))
+        sectional_text = label_texts.get('分段時間')
         if sectional_text:
             parent = sectional_text.parent
             if parent:
                 next_element = parent.find_next()
                 if next_element:
                     sectional_breakdown = next_element.get_text(strip=True)
-                    sectional_times = re.findall(r'([0-9.]+)', sectional_breakdown)
+                    sectional_times = _SECTIONAL_RE.findall(sectional_breakdown)
 
                     if sectional_times:
                         try:
-                            float_times = [float(t) for t in sectional_times if t.replace('.', '').isdigit()]
+                            float_times = [float(t) for t in sectional_times if _FLOAT_RE.match(t)]
                             if len(float_times) >= 2:
                                 # Calculate pace analysis
-                                early_pace = sum(float_times[:2]) if len(float_times) >= 2 else 0
-                                late_pace = sum(float_times[-2:]) if len(float_times) >= 2 else 0
+                                early_pace = sum(float_times[:2])
+                                late_pace = sum(float_times[-2:])
 
                                 speed_analysis["early_pace"] = round(early_pace, 2)
                                 speed_analysis["late_pace"] = round(late_pace, 2)
@@ -1392,21 +1534,21 @@ def extract_speed_analysis(soup):
 
                                 # Calculate sectional speed variations
                                 if len(float_times) >= 3:
-                                    speed_variations = []
-                                    for i in range(1, len(float_times)):
-                                        variation = float_times[i] - float_times[i-1]
-                                        speed_variations.append(round(variation, 2))
+                                    speed_variations = [round(later - earlier, 2)
+                                                        for earlier, later in zip(float_times, float_times[1:])]
 
                                     speed_analysis["sectional_variations"] = speed_variations
-                                    speed_analysis["max_acceleration"] = min(speed_variations) if speed_variations else 0
-                                    speed_analysis["max_deceleration"] = max(speed_variations) if speed_variations else 0
+                                    speed_analysis["max_acceleration"] = min(speed_variations)
+                                    speed_analysis["max_deceleration"] = max(speed_variations)
 
-                        except Exception as e:
+                        except ValueError as e:
                             print(f"Error in sectional speed analysis: {str(e)}")
 
         # Extract overall race speed rating
-        distance_match = re.search(r'(\d+)米', soup.get_text())
-        time_text = soup.find(text=re.compile(r'時間'))
+        if page_text is None:
+            page_text = soup.get_text()
+        distance_match = _DIST_RE.search(page_text)
+        time_text = label_texts.get('時間')
 
         if distance_match and time_text:
             try:
@@ -1416,7 +1558,7 @@ def extract_speed_analysis(soup):
                     next_element = parent.find_next()
                     if next_element:
                         times_text = next_element.get_text(strip=True)
-                        final_time_match = re.search(r'\(([0-9:]+\.[0-9]+)\)$', times_text)
+                        final_time_match = _FINAL_TIME_RE.search(times_text)
                         if final_time_match:
                             final_time = final_time_match.group(1)
 
@@ -1425,38 +1567,27 @@ def extract_speed_analysis(soup):
                             if len(time_parts) == 2:
                                 total_seconds = float(time_parts[0]) * 60 + float(time_parts[1])
 
-                                # Calculate speed rating based on distance standards
-                                standard_times = {
-                                    1000: 57.0,  # Standard time for 1000m
-                                    1200: 69.0,  # Standard time for 1200m
-                                    1400: 81.0,  # Standard time for 1400m
-                                    1600: 93.0,  # Standard time for 1600m
-                                    1800: 105.0, # Standard time for 1800m
-                                    2000: 117.0  # Standard time for 2000m
-                                }
-
-                                # Find closest standard distance
-                                closest_distance = min(standard_times.keys(),
-                                                     key=lambda x: abs(x - distance))
-
-                                if closest_distance in standard_times:
-                                    standard_time = standard_times[closest_distance]
-                                    # Adjust for actual distance
-                                    adjusted_standard = standard_time * (distance / closest_distance)
-
-                                    speed_rating = (adjusted_standard / total_seconds) * 100
-                                    speed_analysis["speed_rating"] = round(speed_rating, 1)
-
-                                    if speed_rating >= 105:
-                                        speed_analysis["speed_class"] = "exceptional"
-                                    elif speed_rating >= 100:
-                                        speed_analysis["speed_class"] = "fast"
-                                    elif speed_rating >= 95:
-                                        speed_analysis["speed_class"] = "average"
-                                    else:
-                                        speed_analysis["speed_class"] = "slow"
+                                # Calculate speed rating against the closest standard distance
+                                i = _closest_standard_distance(distance)
+                                closest_distance = _STANDARD_DISTANCES[i]
+                                standard_time = _STANDARD_TIMES[i]
+
+                                # Adjust for actual distance
+                                adjusted_standard = standard_time * (distance / closest_distance)
+
+                                speed_rating = (adjusted_standard / total_seconds) * 100
+                                speed_analysis["speed_rating"] = round(speed_rating, 1)
+
+                                if speed_rating >= 105:
+                                    speed_analysis["speed_class"] = "exceptional"
+                                elif speed_rating >= 100:
+                                    speed_analysis["speed_class"] = "fast"
+                                elif speed_rating >= 95:
+                                    speed_analysis["speed_class"] = "average"
+                                else:
+                                    speed_analysis["speed_class"] = "slow"
 
-            except Exception as e:
+            except (ValueError, ZeroDivisionError) as e:
                 print(f"Error in speed rating calculation: {str(e)}")
 
         return speed_analysis
@@ -1465,93 +1596,71 @@ def extract_speed_analysis(soup):
         print(f"Error extracting speed analysis: {str(e)}")
         return {}
 
-def extract_statistical_data(soup):
-    """Extract statistical and analytical data from the race."""
+def extract_statistical_data(soup, tables=None, results_rows_by_table=None):
+    """Extract statistical and analytical data from the race.
+
+    results_rows_by_table: optional _extract_results_rows([table]) for each table, if already computed
+    """
     statistical_data = {}
 
     try:
-        # Extract field size and competitiveness metrics
-        tables = soup.find_all('table')
-
-        for table in tables:
-            rows = table.find_all('tr')
-
-            # Count number of finishers
-            finisher_count = 0
-            win_odds_list = []
-            margins_list = []
-
-            for row in rows:
-                cells = row.find_all('td')
-
-                if len(cells) >= 10:
-                    first_cell = cells[0].get_text(strip=True)
-
-                    if first_cell.isdigit() and int(first_cell) <= 20:
-                        finisher_count += 1
-
-                        # Collect win odds for analysis
-                        if len(cells) > 11:
-                            odds_text = cells[-1].get_text(strip=True)
-                            if odds_text and odds_text.replace('.', '').isdigit():
-                                win_odds_list.append(float(odds_text))
-
-                        # Collect margins for competitiveness analysis
-                        if len(cells) > 8:
-                            margin_text = cells[8].get_text(strip=True)
-                            if margin_text and margin_text != "-":
-                                margins_list.append(margin_text)
-
-            if finisher_count > 0:
-                statistical_data["field_size"] = finisher_count
-
-                # Calculate odds statistics
-                if win_odds_list:
-                    statistical_data["odds_statistics"] = {
-                        "favorite_odds": min(win_odds_list),
-                        "longest_odds": max(win_odds_list),
-                        "average_odds": round(sum(win_odds_list) / len(win_odds_list), 2),
-                        "odds_range": round(max(win_odds_list) - min(win_odds_list), 2)
-                    }
-
-                    # Calculate market competitiveness
-                    if len(win_odds_list) >= 3:
-                        top_3_odds = sorted(win_odds_list)[:3]
-                        competitiveness = sum(top_3_odds) / 3
-
-                        if competitiveness <= 5.0:
-                            statistical_data["market_competitiveness"] = "highly_competitive"
-                        elif competitiveness <= 10.0:
-                            statistical_data["market_competitiveness"] = "competitive"
-                        else:
-                            statistical_data["market_competitiveness"] = "open"
+        # Extract field size and competitiveness metrics from the first table with
+        # results rows, reusing each row's cell texts
+        if results_rows_by_table is None:
+            if tables is None:
+                tables = soup.find_all('table')
+            results_rows_by_table = [_extract_results_rows([table]) for table in tables]
+        finisher_rows = next((rows for rows in results_rows_by_table if rows), None)
+
+        if finisher_rows:
+            statistical_data["field_size"] = len(finisher_rows)
+
+            # Collect win odds and margins for analysis
+            win_odds_list = [float(texts[-1]) for texts in finisher_rows
+                             if len(texts) > 11 and texts[-1] and _FLOAT_RE.match(texts[-1])]
+            margins_list = [texts[8] for texts in finisher_rows if texts[8] and texts[8] != "-"]
+
+            # Calculate odds statistics
+            if win_odds_list:
+                statistical_data["odds_statistics"] = {
+                    "favorite_odds": min(win_odds_list),
+                    "longest_odds": max(win_odds_list),
+                    "average_odds": round(sum(win_odds_list) / len(win_odds_list), 2),
+                    "odds_range": round(max(win_odds_list) - min(win_odds_list), 2)
+                }
+
+                # Calculate market competitiveness
+                if len(win_odds_list) >= 3:
+                    top_3_odds = heapq.nsmallest(3, win_odds_list)
+                    competitiveness = sum(top_3_odds) / 3
+
+                    if competitiveness <= 5.0:
+                        statistical_data["market_competitiveness"] = "highly_competitive"
+                    elif competitiveness <= 10.0:
+                        statistical_data["market_competitiveness"] = "competitive"
+                    else:
+                        statistical_data["market_competitiveness"] = "open"
 
-                # Analyze race competitiveness based on margins
-                if margins_list:
-                    close_finishes = sum(1 for margin in margins_list[:5]
-                                       if any(keyword in margin for keyword in ['短', '頭', '1/2', '1/4']))
+            # Analyze race competitiveness based on margins
+            if margins_list:
+                close_finishes = sum(1 for margin in margins_list[:5] if _has_keyword(margin, _CLOSE_FINISH_AUTOMATON, _CLOSE_FINISH_RE))
 
-                    statistical_data["close_finish_count"] = close_finishes
+                statistical_data["close_finish_count"] = close_finishes
 
-                    if close_finishes >= 3:
-                        statistical_data["race_competitiveness"] = "very_competitive"
-                    elif close_finishes >= 2:
-                        statistical_data["race_competitiveness"] = "competitive"
-                    else:
-                        statistical_data["race_competitiveness"] = "decisive"
-
-                break  # Found the results table
+                if close_finishes >= 3:
+                    statistical_data["race_competitiveness"] = "very_competitive"
+                elif close_finishes >= 2:
+                    statistical_data["race_competitiveness"] = "competitive"
+                else:
+                    statistical_data["race_competitiveness"] = "decisive"
 
-        # Extract class and rating information
-        race_text_elements = soup.find_all(text=True)
-        for text in race_text_elements:
+        # Extract class and rating information from the first text naming a class;
+        # the text nodes are streamed, so the walk stops there
+        for text in _iter_text_nodes(soup):
             if "第" in text and "班" in text:
-                class_match = re.search(r'第([一二三四五])班', text)
+                class_match = _CLASS_NUMBER_RE.search(text)
                 if class_match:
-                    class_mapping = {
-                        "一": 1, "二": 2, "三": 3, "四": 4, "五": 5
-                    }
-                    class_number = class_mapping.get(class_match.group(1), 0)
+                    class_number = _CLASS_NUMBERS.get(class_match.group(1), 0)
                     statistical_data["race_class"] = class_number
 
                     # Add class competitiveness rating
@@ -1563,7 +1672,7 @@ def extract_statistical_data(soup):
                         statistical_data["class_level"] = "entry"
 
                 # Extract rating range
-                rating_match = re.search(r'\(([0-9-]+)\)', text)
+                rating_match = _RATING_RE.search(text)
                 if rating_match:
                     rating_range = rating_match.group(1)
                     statistical_data["rating_range"] = rating_range
@@ -1575,7 +1684,7 @@ def extract_statistical_data(soup):
                             statistical_data["min_rating"] = int(min_rating)
                             statistical_data["max_rating"] = int(max_rating)
                             statistical_data["rating_spread"] = int(max_rating) - int(min_rating)
-                        except:
+                        except ValueError:
                             pass
 
                 break
@@ -1613,46 +1722,52 @@ def analyze_margins_from_horses(horse_performance):
     try:
         margins = []
         for horse in horse_performance:
-            margin = horse.get("performance_metrics", {}).get("margin", "")
+            margin = horse.get("performance_metrics", _NO_METRICS).get("margin", "")
             position = horse.get("position", 0)
             if margin and margin != "-" and position > 1:
                 margins.append({"margin": margin, "position": position})
 
         if margins:
             # Count close finishes (using keywords from the original function)
-            close_margins = sum(1 for m in margins[:5] if any(keyword in m["margin"]
-                              for keyword in ["短", "頭", "1/2", "1/4", "頸"]))
-
-            margin_analysis["close_finishes_top_6"] = close_margins
-            margin_analysis["total_margins_recorded"] = len(margins)
+            close_margins = sum(1 for m in margins[:5] if _has_keyword(m["margin"], _CLOSE_MARGIN_AUTOMATON, _CLOSE_MARGIN_RE))
 
             # Determine race competitiveness
             if close_margins >= 4:
-                margin_analysis["competitiveness"] = "extremely_competitive"
+                competitiveness = "extremely_competitive"
             elif close_margins >= 3:
-                margin_analysis["competitiveness"] = "very_competitive"
+                competitiveness = "very_competitive"
             elif close_margins >= 2:
-                margin_analysis["competitiveness"] = "competitive"
+                competitiveness = "competitive"
             else:
-                margin_analysis["competitiveness"] = "decisive"
+                competitiveness = "decisive"
+
+            margin_analysis = {
+                "close_finishes_top_6": close_margins,
+                "total_margins_recorded": len(margins),
+                "competitiveness": competitiveness
+            }
 
     except Exception as e:
         print(f"Error analyzing margins: {str(e)}")
 
     return margin_analysis
 
+def _favourite_odds(horse):
+    """Sort key ranking horses by win odds; horses without odds sort last."""
+    return horse.get("performance_metrics", _NO_METRICS).get("win_odds", 999)
+
 def analyze_favorites_from_horses(horse_performance):
     """Analyze favorites performance from horse performance data."""
     favorites_performance = {}
 
     try:
-        # Sort by odds to find favorites
-        horses_by_odds = sorted(horse_performance, key=lambda x: x.get("performance_metrics", {}).get("win_odds", 999))
+        # The three shortest-priced horses; nsmallest keeps the stable order of sorted()[:3]
+        horses_by_odds = heapq.nsmallest(3, horse_performance, key=_favourite_odds)
 
         if len(horses_by_odds) >= 3:
             top_3_favorites = []
             for horse in horses_by_odds[:3]:
-                metrics = horse.get("performance_metrics", {})
+                metrics = horse.get("performance_metrics", _NO_METRICS)
                 top_3_favorites.append({
                     "horse_name": horse.get("horse_name", ""),
                     "position": horse.get("position", 0),
@@ -1673,7 +1788,7 @@ def analyze_favorites_from_horses(horse_performance):
 
             favorites_performance["market_leader"] = {
                 "horse_name": market_leader.get("horse_name", ""),
-                "odds": market_leader.get("performance_metrics", {}).get("win_odds", 0),
+                "odds": market_leader.get("performance_metrics", _NO_METRICS).get("win_odds", 0),
                 "position": leader_position,
                 "performance": performance_desc
             }
@@ -1688,27 +1803,38 @@ def analyze_weight_from_horses(horse_performance):
     weight_distribution = {}
 
     try:
-        weights = []
+        # Single pass: count, total, extremes and the best position at each extreme
+        count = 0
+        total = 0
+        min_weight = max_weight = None
+        top_weight_best_position = bottom_weight_best_position = None
         for horse in horse_performance:
-            weight = horse.get("performance_metrics", {}).get("weight_carried", 0)
+            weight = horse.get("performance_metrics", _NO_METRICS).get("weight_carried", 0)
             position = horse.get("position", 0)
-            if weight and position:
-                weights.append({"weight": weight, "position": position})
-
-        if weights:
-            weight_values = [w["weight"] for w in weights]
-
-            weight_distribution["min_weight"] = min(weight_values)
-            weight_distribution["max_weight"] = max(weight_values)
-            weight_distribution["average_weight"] = round(sum(weight_values) / len(weight_values), 1)
-            weight_distribution["weight_spread"] = max(weight_values) - min(weight_values)
-
-            # Find best positions for top and bottom weights
-            top_weight_horses = [w for w in weights if w["weight"] == max(weight_values)]
-            bottom_weight_horses = [w for w in weights if w["weight"] == min(weight_values)]
-
-            weight_distribution["top_weight_best_position"] = min(h["position"] for h in top_weight_horses)
-            weight_distribution["bottom_weight_best_position"] = min(h["position"] for h in bottom_weight_horses)
+            if not (weight and position):
+                continue
+
+            count += 1
+            total += weight
+            if max_weight is None or weight > max_weight:
+                max_weight, top_weight_best_position = weight, position
+            elif weight == max_weight and position < top_weight_best_position:
+                top_weight_best_position = position
+            if min_weight is None or weight < min_weight:
+                min_weight, bottom_weight_best_position = weight, position
+            elif weight == min_weight and position < bottom_weight_best_position:
+                bottom_weight_best_position = position
+
+        if count:
+            weight_distribution = {
+                "min_weight": min_weight,
+                "max_weight": max_weight,
+                "average_weight": round(total / count, 1),
+                "weight_spread": max_weight - min_weight,
+                # Best positions for top and bottom weights
+                "top_weight_best_position": top_weight_best_position,
+                "bottom_weight_best_position": bottom_weight_best_position
+            }
 
     except Exception as e:
         print(f"Error analyzing weight distribution: {str(e)}")
@@ -1720,39 +1846,51 @@ def analyze_odds_from_horses(horse_performance):
     odds_analysis = {}
 
     try:
-        odds_data = []
+        # Single pass: count, total, extremes, winner's odds and placed longshots
+        count = 0
+        total = 0
+        shortest_odds = longest_odds = winner_odds = None
+        longshots_placed = 0
         for horse in horse_performance:
-            metrics = horse.get("performance_metrics", {})
-            odds = metrics.get("win_odds", 0)
+            odds = horse.get("performance_metrics", _NO_METRICS).get("win_odds", 0)
             position = horse.get("position", 0)
-            if odds and position:
-                odds_data.append({"odds": odds, "position": position})
-
-        if odds_data:
-            odds_values = [o["odds"] for o in odds_data]
-
-            odds_analysis["shortest_odds"] = min(odds_values)
-            odds_analysis["longest_odds"] = max(odds_values)
-            odds_analysis["average_odds"] = round(sum(odds_values) / len(odds_values), 2)
-            odds_analysis["odds_range"] = max(odds_values) - min(odds_values)
+            if not (odds and position):
+                continue
+
+            count += 1
+            total += odds
+            if shortest_odds is None or odds < shortest_odds:
+                shortest_odds = odds
+            if longest_odds is None or odds > longest_odds:
+                longest_odds = odds
+            if position == 1 and winner_odds is None:
+                winner_odds = odds
+            # Longshots in first 3
+            if odds >= 15.0 and position <= 3:
+                longshots_placed += 1
+
+        if count:
+            odds_analysis = {
+                "shortest_odds": shortest_odds,
+                "longest_odds": longest_odds,
+                "average_odds": round(total / count, 2),
+                "odds_range": longest_odds - shortest_odds
+            }
 
             # Winner odds
-            winner = next((o for o in odds_data if o["position"] == 1), None)
-            if winner:
-                odds_analysis["winner_odds"] = winner["odds"]
+            if winner_odds:
+                odds_analysis["winner_odds"] = winner_odds
 
                 # Market efficiency
-                if winner["odds"] <= 3.0:
+                if winner_odds <= 3.0:
                     odds_analysis["market_efficiency"] = "strong_favorite_won"
-                elif winner["odds"] <= 8.0:
+                elif winner_odds <= 8.0:
                     odds_analysis["market_efficiency"] = "moderate_favorite_won"
-                elif winner["odds"] <= 15.0:
+                elif winner_odds <= 15.0:
                     odds_analysis["market_efficiency"] = "minor_upset"
                 else:
                     odds_analysis["market_efficiency"] = "major_upset"
 
-            # Count longshots in first 3
-            longshots_placed = sum(1 for o in odds_data if o["odds"] >= 15.0 and o["position"] <= 3)
             odds_analysis["longshots_placed"] = longshots_placed
 
     except Exception as e:
@@ -1772,8 +1910,7 @@ def save_results_to_json(results_data, race_date, racecourse, race_no):
         filepath = os.path.join(OUTPUT_DIR, filename)
 
         # Save to JSON file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(results_data, f, ensure_ascii=False, indent=2)
+        write_file_atomic(filepath, dumps_json(results_data))
 
         print(f"Results saved to: {filepath}")
         return True
@@ -1808,8 +1945,7 @@ def save_payouts_to_json(results_data, race_date, racecourse, race_no):
         }
 
         # Save payout data to JSON file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(payout_data, f, ensure_ascii=False, indent=2)
+        write_file_atomic(filepath, dumps_json(payout_data))
 
         print(f"Payouts (派彩) saved to: {filepath}")
         return True
@@ -1853,37 +1989,23 @@ def save_incidents_to_json(results_data, race_date, racecourse, race_no):
             # Remove summary from incidents list for analysis
             incident_list = [i for i in incidents if "summary" not in i]
 
-            # Create detailed analysis
-            incident_analysis = {
-                "total_horses": len(incident_list),
-                "horses_with_incidents": len([i for i in incident_list if i.get('incident_type') != 'no_incident']),
-                "horses_no_incidents": len([i for i in incident_list if i.get('incident_type') == 'no_incident']),
-                "incident_rate": 0,
-                "severity_breakdown": {},
-                "incident_type_breakdown": {},
-                "most_serious_incidents": [],
-                "stewards_actions": []
-            }
-
-            if incident_analysis["total_horses"] > 0:
-                incident_analysis["incident_rate"] = round(
-                    (incident_analysis["horses_with_incidents"] / incident_analysis["total_horses"]) * 100, 1
-                )
-
-            # Analyze severity and types
-            severity_count = {}
-            incident_type_count = {}
+            # Tally severities, types and notable incidents in a single pass
+            severity_count = Counter()
+            incident_type_count = Counter()
+            horses_with_incidents = 0
             serious_incidents = []
             stewards_actions = []
 
             for incident in incident_list:
-                # Count severity
                 severity = incident.get('severity', 'unknown')
-                severity_count[severity] = severity_count.get(severity, 0) + 1
-
-                # Count incident types
                 incident_type = incident.get('incident_type', 'unknown')
-                incident_type_count[incident_type] = incident_type_count.get(incident_type, 0) + 1
+                report = incident.get('incident_report', '')
+
+                # Count severity and incident types
+                severity_count[severity] += 1
+                incident_type_count[incident_type] += 1
+                if incident_type != 'no_incident':
+                    horses_with_incidents += 1
 
                 # Collect serious incidents
                 if severity == 'high':
@@ -1891,29 +2013,35 @@ def save_incidents_to_json(results_data, race_date, racecourse, race_no):
                         "horse_name": incident.get('horse_name', ''),
                         "position": incident.get('position', 0),
                         "incident_type": incident_type,
-                        "report": incident.get('incident_report', '')
+                        "report": report
                     })
 
                 # Collect stewards actions
-                if 'stewards_reprimand' in incident_type or '小組譴責' in incident.get('incident_report', ''):
-                    stewards_actions.append({
-                        "horse_name": incident.get('horse_name', ''),
-                        "position": incident.get('position', 0),
-                        "action": "reprimand",
-                        "report": incident.get('incident_report', '')
-                    })
-                elif '必須試閘及格' in incident.get('incident_report', ''):
-                    stewards_actions.append({
-                        "horse_name": incident.get('horse_name', ''),
-                        "position": incident.get('position', 0),
-                        "action": "barrier_trial_required",
-                        "report": incident.get('incident_report', '')
-                    })
+                if 'stewards_reprimand' in incident_type or '小組譴責' in report:
+                    action = "reprimand"
+                elif '必須試閘及格' in report:
+                    action = "barrier_trial_required"
+                else:
+                    continue
+                stewards_actions.append({
+                    "horse_name": incident.get('horse_name', ''),
+                    "position": incident.get('position', 0),
+                    "action": action,
+                    "report": report
+                })
 
-            incident_analysis["severity_breakdown"] = severity_count
-            incident_analysis["incident_type_breakdown"] = incident_type_count
-            incident_analysis["most_serious_incidents"] = serious_incidents
-            incident_analysis["stewards_actions"] = stewards_actions
+            # Create detailed analysis
+            total_horses = len(incident_list)
+            incident_analysis = {
+                "total_horses": total_horses,
+                "horses_with_incidents": horses_with_incidents,
+                "horses_no_incidents": total_horses - horses_with_incidents,
+                "incident_rate": round((horses_with_incidents / total_horses) * 100, 1) if total_horses > 0 else 0,
+                "severity_breakdown": dict(severity_count),
+                "incident_type_breakdown": dict(incident_type_count),
+                "most_serious_incidents": serious_incidents,
+                "stewards_actions": stewards_actions
+            }
 
             # Add race safety assessment
             if incident_analysis["incident_rate"] >= 70:
@@ -1930,8 +2058,7 @@ def save_incidents_to_json(results_data, race_date, racecourse, race_no):
             incident_data["incidents"] = incident_list
 
         # Save to JSON file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(incident_data, f, ensure_ascii=False, indent=2)
+        write_file_atomic(filepath, dumps_json(incident_data))
 
         print(f"Incidents (競賽事件報告) saved to: {filepath}")
         return True
@@ -1940,21 +2067,68 @@ def save_incidents_to_json(results_data, race_date, racecourse, race_no):
         print(f"Error saving incidents to JSON: {str(e)}")
         return False
 
+def performance_json_path(race_date, racecourse, race_no):
+    """Return the path of the consolidated performance JSON file for a race."""
+    safe_date = race_date.replace('/', '-')
+    return os.path.join(PERFORMANCE_DIR, f"performance_{safe_date}_{racecourse}_R{race_no}.json")
+
+def load_cached_results(race_date, racecourse, race_no):
+    """
+    Load previously extracted results for a settled race.
+    
+    Args:
+        race_date (str): Race date in format YYYY/MM/DD
+        racecourse (str): Racecourse code ("ST" or "HV")
+        race_no (int): Race number
+    
+    Returns:
+        dict: Race results data from the race's performance JSON, or None if the race
+              is too recent, hasn't been extracted yet, was extracted by another
+              extractor version or was saved without results
+    """
+    if RESULTS_CACHE_MIN_AGE_DAYS < 0:
+        return None
+
+    try:
+        race_day = datetime.strptime(race_date, "%Y/%m/%d")
+    except ValueError:
+        return None
+    if (datetime.now() - race_day).days < RESULTS_CACHE_MIN_AGE_DAYS:
+        return None
+
+    filepath = performance_json_path(race_date, racecourse, race_no)
+    if not os.path.exists(filepath):
+        return None
+
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            results_data = json.load(f)
+    except Exception as e:
+        print(f"Error reading cached results from {filepath}: {str(e)}")
+        return None
+
+    if (not isinstance(results_data, dict)
+            or results_data.get("extractor_version") != RESULTS_EXTRACTOR_VERSION
+            or not results_data.get("results") or not results_data.get("race_info")):
+        return None
+
+    print(f"Using cached results for Race {race_no}: {filepath}")
+    return results_data
+
 def save_performance_json(results_data, race_date, racecourse, race_no):
     """Save consolidated performance JSON file containing all race data."""
     try:
         # Create performance_data directory if it doesn't exist
-        performance_dir = "performance_data"
-        os.makedirs(performance_dir, exist_ok=True)
+        os.makedirs(PERFORMANCE_DIR, exist_ok=True)
 
         # Create filename for consolidated performance data
-        safe_date = race_date.replace('/', '-')
-        filename = f"performance_{safe_date}_{racecourse}_R{race_no}.json"
-        filepath = os.path.join(performance_dir, filename)
+        filepath = performance_json_path(race_date, racecourse, race_no)
 
-        # Save consolidated data to JSON file (results_data already contains everything)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(results_data, f, ensure_ascii=False, indent=2)
+        # Save consolidated data to JSON file (results_data already contains everything),
+        # stamped so load_cached_results only reuses output of this extractor version
+        if results_data.get("extractor_version") != RESULTS_EXTRACTOR_VERSION:
+            results_data = {**results_data, "extractor_version": RESULTS_EXTRACTOR_VERSION}
+        write_file_atomic(filepath, dumps_json(results_data))
 
         print(f"Consolidated performance data saved to: {filepath}")
         return True
@@ -1963,6 +2137,31 @@ def save_performance_json(results_data, race_date, racecourse, race_no):
         print(f"Error saving performance JSON: {str(e)}")
         return False
 
+# Race results keys stored verbatim in their own PocketBase columns; raw_data
+# carries only the rest, so the record doesn't hold (and upload) them twice
+_RECORD_COLUMNS = frozenset(("race_date", "racecourse", "race_number", "sectional_times",
+                             "results", "payouts", "incidents"))
+
+def build_pocketbase_record(results_data):
+    """Map extracted race results onto the PocketBase collection schema."""
+    return {
+        "race_date": results_data["race_date"],
+        "racecourse": results_data["racecourse"],
+        "race_number": results_data["race_number"],
+        "race_name": results_data["race_info"].get("full_text", ""),
+        "race_class": results_data["race_info"].get("race_class", ""),
+        "distance": results_data["race_info"].get("distance", ""),
+        "track_condition": results_data["race_info"].get("track_condition", ""),
+        "track_type": results_data["race_info"].get("track_type", ""),
+        "prize_money": results_data["race_info"].get("prize_money", ""),
+        "race_time": results_data["sectional_times"].get("times", [])[-1] if results_data["sectional_times"].get("times") else "",
+        "sectional_times": results_data["sectional_times"],
+        "results": results_data["results"],
+        "payouts": results_data["payouts"],
+        "incidents": results_data["incidents"],
+        "raw_data": {key: value for key, value in results_data.items() if key not in _RECORD_COLUMNS}
+    }
+
 def save_results_to_pocketbase(results_data):
     """Save race results to PocketBase."""
     try:
@@ -1974,27 +2173,8 @@ def save_results_to_pocketbase(results_data):
         pb = PocketBase(POCKETBASE_URL)
         pb.collection("users").auth_with_password(POCKETBASE_EMAIL, POCKETBASE_PASSWORD)
 
-        # Prepare data for PocketBase
-        pb_data = {
-            "race_date": results_data["race_date"],
-            "racecourse": results_data["racecourse"],
-            "race_number": results_data["race_number"],
-            "race_name": results_data["race_info"].get("full_text", ""),
-            "race_class": results_data["race_info"].get("race_class", ""),
-            "distance": results_data["race_info"].get("distance", ""),
-            "track_condition": results_data["race_info"].get("track_condition", ""),
-            "track_type": results_data["race_info"].get("track_type", ""),
-            "prize_money": results_data["race_info"].get("prize_money", ""),
-            "race_time": results_data["sectional_times"].get("times", [])[-1] if results_data["sectional_times"].get("times") else "",
-            "sectional_times": results_data["sectional_times"],
-            "results": results_data["results"],
-            "payouts": results_data["payouts"],
-            "incidents": results_data["incidents"],
-            "raw_data": results_data
-        }
-
         # Create record in PocketBase
-        record = pb.collection(COLLECTION_NAME).create(pb_data)
+        record = pb.collection(COLLECTION_NAME).create(build_pocketbase_record(results_data))
         print(f"Results saved to PocketBase with ID: {record.id}")
         return True
 
@@ -2002,6 +2182,78 @@ def save_results_to_pocketbase(results_data):
         print(f"Error saving results to PocketBase: {str(e)}")
         return False
 
+def save_results_batch_to_pocketbase(results_list):
+    """
+    Save several races to PocketBase in as few round-trips as possible.
+    
+    Records are sent PB_BATCH_SIZE at a time through the /api/batch endpoint
+    (PocketBase >= 0.23 with batch requests enabled). If a batch request fails
+    (batch API unavailable, or a record rejected), the races of that batch are
+    saved one at a time instead.
+    
+    Args:
+        results_list (list): Race results data dicts
+    
+    Returns:
+        int: Number of races saved
+    """
+    if not results_list:
+        return 0
+
+    try:
+        if not POCKETBASE_URL or not POCKETBASE_EMAIL or not POCKETBASE_PASSWORD:
+            print("PocketBase configuration not found. Skipping PocketBase save.")
+            return 0
+
+        token = _get_pb_token()
+        if not token:
+            return 0
+
+        session = _get_pb_session()
+        saved = 0
+        for start in range(0, len(results_list), PB_BATCH_SIZE):
+            batch = results_list[start:start + PB_BATCH_SIZE]
+            payload = {
+                "requests": [
+                    {
+                        "method": "POST",
+                        "url": f"/api/collections/{COLLECTION_NAME}/records",
+                        "body": build_pocketbase_record(results_data)
+                    }
+                    for results_data in batch
+                ]
+            }
+
+            response = session.post(f"{POCKETBASE_URL}/api/batch", json=payload,
+                                    headers={"Authorization": f"Bearer {token}"})
+
+            # A cached token may have expired; log in again and retry once
+            if response.status_code == 401:
+                token = _get_pb_token(refresh=True)
+                if not token:
+                    return saved
+                response = session.post(f"{POCKETBASE_URL}/api/batch", json=payload,
+                                        headers={"Authorization": f"Bearer {token}"})
+
+            if response.status_code == 200:
+                saved += len(batch)
+                print(f"Saved {len(batch)} races to PocketBase in one batch request")
+            else:
+                # The batch is all-or-nothing: the batch API may be missing or disabled
+                # (403/404) or one invalid record may have failed it (400), so save the
+                # races one at a time and lose only the ones that fail on their own
+                if response.status_code in (403, 404):
+                    print(f"PocketBase batch API unavailable (HTTP {response.status_code}); saving races one at a time")
+                else:
+                    print(f"Failed to save batch to PocketBase (HTTP {response.status_code}): {response.text}; saving races one at a time")
+                saved += sum(1 for results_data in batch if save_results_to_pocketbase(results_data))
+
+        return saved
+
+    except Exception as e:
+        print(f"Error saving results batch to PocketBase: {str(e)}")
+        return 0
+
 async def scrape_multiple_races(race_date, racecourse, race_numbers):
     """
     Scrape results for multiple races.
@@ -2020,19 +2272,22 @@ async def scrape_multiple_races(race_date, racecourse, race_numbers):
     if POCKETBASE_URL:
         ensure_results_collection_exists()
 
-    for race_no in race_numbers:
-        print(f"\nScraping Race {race_no}...")
+    print(f"\nScraping Races {', '.join(map(str, race_numbers))}...")
+    try:
+        results_by_race = await scrape_races_results(race_date, racecourse, race_numbers)
+    except Exception as e:
+        print(f"Error scraping races: {str(e)}")
+        return all_results
 
+    saved_files = 0
+    for race_no in race_numbers:
         try:
-            results_data = await scrape_race_results(race_date, racecourse, race_no)
+            results_data = results_by_race[race_no]
 
             if results_data:
                 # Save consolidated performance JSON file (contains everything)
-                save_performance_json(results_data, race_date, racecourse, race_no)
-
-                # Save to PocketBase if configured
-                if POCKETBASE_URL:
-                    save_results_to_pocketbase(results_data)
+                if save_performance_json(results_data, race_date, racecourse, race_no):
+                    saved_files += 1
 
                 all_results.append(results_data)
                 print(f"Successfully scraped Race {race_no}")
@@ -2042,12 +2297,17 @@ async def scrape_multiple_races(race_date, racecourse, race_numbers):
         except Exception as e:
             print(f"Error scraping Race {race_no}: {str(e)}")
 
+    if all_results:
+        print(f"Saved {saved_files}/{len(all_results)} performance JSON files")
+
+    # Save to PocketBase if configured, batching every race of the meeting together
+    if POCKETBASE_URL:
+        save_results_batch_to_pocketbase(all_results)
+
     return all_results
 
 def main():
     """Main function with command line argument support."""
-    import sys
-
     # Parse command line arguments
     if len(sys.argv) >= 2:
         race_date = sys.argv[1]  # Format: YYYY/MM/DD
@@ -2088,6 +2348,10 @@ def main():
         print(f"PocketBase Collection: {COLLECTION_NAME}")
     print()
 
+    # Use uvloop's faster event loop where it is available
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     # Run the scraper
     results = asyncio.run(scrape_multiple_races(race_date, racecourse, race_numbers))
 
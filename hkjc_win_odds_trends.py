@@ -2,7 +2,7 @@ import asyncio
 import json
 import re
 import os
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -12,6 +12,43 @@ load_dotenv()
 # Output directory for JSON files
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "win_odds_data")
 
+# Resource types never needed for the DOM text and odds XHRs; they are aborted
+# so the page doesn't download them
+_BLOCKED_RESOURCE_TYPES = frozenset(('image', 'stylesheet', 'font', 'media', 'texttrack', 'beacon', 'imageset'))
+
+# URL fragments of the XHRs that may carry the odds themselves; a JSON response
+# from one of these replaces scraping the rendered page only if it holds a WIN
+# pool with per-horse odds (see _has_win_odds)
+_ODDS_XHR_KEYWORDS = ('odds', 'graphql')
+
+# Keys naming a pool's bet type, and keys holding a runner's odds, in the odds JSON
+_POOL_TYPE_KEYS = ('oddsType', 'poolType', 'betType', 'pool')
+_ODDS_VALUE_KEYS = ('oddsValue', 'odds', 'winOdds')
+
+def _has_win_odds(data):
+    """Return True if data contains a WIN pool with a list of per-horse odds nodes"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict):
+            if any(str(node.get(key, '')).upper() == 'WIN' for key in _POOL_TYPE_KEYS):
+                for value in node.values():
+                    if (isinstance(value, list) and value
+                            and all(isinstance(item, dict) and any(key in item for key in _ODDS_VALUE_KEYS)
+                                    for item in value)):
+                        return True
+            stack.extend(node.values())
+    return False
+
+async def _block_static_assets(route):
+    """Abort requests for static assets, let everything else through"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 def parse_url(url):
     """Parse HKJC odds URL to extract race details"""
     patterns = [
@@ -59,6 +96,7 @@ async def get_win_odds_trends(url):
             )
             
             page = await context.new_page()
+            await page.route('**/*', _block_static_assets)
             
             # Capture network requests to find odds data
             odds_requests = []
@@ -98,8 +136,12 @@ async def get_win_odds_trends(url):
                 print("🌐 Navigating to the betting page...")
                 await page.goto(url, wait_until='domcontentloaded', timeout=30000)
                 
-                # Wait for initial load
-                await page.wait_for_timeout(5000)
+                # Wait for initial load; without images and fonts the network settles
+                # sooner, but a page that keeps polling is given no longer than before
+                try:
+                    await page.wait_for_load_state('networkidle', timeout=5000)
+                except PlaywrightTimeoutError:
+                    pass
                 
                 # Try to find and click on Win Odds section
                 print("🔍 Looking for Win Odds section...")
@@ -158,11 +200,23 @@ async def get_win_odds_trends(url):
                 print("⏳ Waiting for odds data to load...")
                 await page.wait_for_timeout(5000)
                 
-                # Try to extract odds data from the page
-                print("🔍 Extracting odds data from page...")
+                # Prefer the win odds JSON the page fetched for itself
+                odds_data = [
+                    {"type": "network", "url": request["url"], "data": request["data"]}
+                    for request in odds_requests
+                    if isinstance(request["data"], (dict, list))
+                    and any(keyword in request["url"].lower() for keyword in _ODDS_XHR_KEYWORDS)
+                    and _has_win_odds(request["data"])
+                ]
                 
-                # Look for tables or containers with odds data
-                odds_data = await extract_win_odds_from_page(page)
+                if odds_data:
+                    odds_source = "network"
+                    print(f"📊 Using {len(odds_data)} odds responses captured from the network")
+                else:
+                    # Fall back to the tables or containers with odds data in the page
+                    print("🔍 Extracting odds data from page...")
+                    odds_data = await extract_win_odds_from_page(page)
+                    odds_source = "page" if odds_data else None
                 
                 # Prepare result
                 result = {
@@ -179,6 +233,7 @@ async def get_win_odds_trends(url):
                         "page_loaded": True,
                         "win_section_found": win_section_found,
                         "odds_data_found": len(odds_data) > 0 if odds_data else False,
+                        "odds_source": odds_source,
                         "network_requests_captured": len(odds_requests)
                     }
                 }